@@ -0,0 +1,77 @@
+"""
+Benchmark of the cold-start time of ``import mscales``.
+
+Every run imports the package in a fresh interpreter with ``-X importtime``
+and reports the wall time of the process, the cumulative import time of
+``mscales`` and whether any of the optional plotting, MIDI or lattice
+libraries were loaded, which would be a regression: they are only imported
+when plots, sounds or concept lattices are actually requested.
+
+Run with ``python benchmarks/bench_import.py [--repeat N] [--top K]``.
+"""
+
+import argparse
+import ast
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+HEAVY_MODULES = ["matplotlib", "pretty_midi", "concepts"]
+ROOT = Path(__file__).parents[1]
+
+
+def import_once(module="mscales"):
+    """Wall time, import-time table and loaded heavy modules of one cold import."""
+    code = (
+        f"import sys, {module}; "
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = time.perf_counter() - start
+
+    # lines of the form "import time: self [us] | cumulative | imported package"
+    table = []
+    for line in out.stderr.splitlines():
+        if line.startswith("import time:") and "[us]" not in line:
+            _, cumulative, name = line[len("import time:") :].split("|")
+            table.append((int(cumulative), name.rstrip()))
+
+    return wall, table, ast.literal_eval(out.stdout)
+
+
+def bench(repeat=10, top=10):
+    walls, totals = [], []
+    for _ in range(repeat):
+        wall, table, heavy = import_once()
+        walls.append(wall)
+        totals.append(next(t for t, name in table if name.strip() == "mscales"))
+
+    print(
+        f"import mscales: {statistics.median(walls) * 1e3:.1f}ms per process,"
+        f" {statistics.median(totals) / 1e3:.1f}ms importing"
+        f" (median of {repeat})"
+    )
+    print(f"optional libraries loaded: {heavy or 'none'}")
+    print("slowest imports of the last run:")
+    for cumulative, name in sorted(table, reverse=True)[:top]:
+        print(f"  {cumulative / 1e3:8.1f}ms {name}")
+
+    return not heavy
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    sys.exit(0 if bench(args.repeat, args.top) else 1)
@@ -0,0 +1,88 @@
+"""
+Benchmark of normal-form computations against the original implementation.
+
+The original `PitchClassSet.normal_form` rebuilt all rotations with `np.roll`
+and compared spans in Python lists. It is reproduced below and compared on
+every set of 12-EDO and (by default a random sample of) every set of 24-EDO
+with the vectorized `setclasses.normal_forms` and the set-class table.
+
+Run with ``python benchmarks/bench_normal_form.py [--all-24]``.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from mscales.scales import Scales
+from mscales.setclasses import lookup, normal_forms
+
+
+def legacy_normal_form(pcs, c):
+    """The original normal-form algorithm (after Rahn), for sorted `pcs`."""
+    if len(pcs) == 1:
+        return pcs
+    rotations = np.array([np.roll(pcs, i) for i in range(pcs.shape[0])])
+    for length in range(len(pcs) - 1, 0, -1):
+        spans = [(r[-1] - r[0]) % c for r in rotations[:, : length + 1]]
+        mask = spans == min(spans)
+        min_span_rotations = rotations[mask]
+        if min_span_rotations.shape[0] == 1:
+            return min_span_rotations.flatten()
+        rotations = min_span_rotations
+    min_idx = np.argmin(min_span_rotations, axis=0)[0]
+    return min_span_rotations[min_idx]
+
+
+def blocks(c, d, block_size=1 << 15):
+    for scales in Scales(c=c, d=d).iter_all(block_size=block_size):
+        yield np.nonzero(scales)[1].reshape(-1, d)
+
+
+def bench(c, sample=None, seed=0):
+    rng = np.random.default_rng(seed)
+    legacy_time = vectorized_time = n_sets = n_legacy = 0
+
+    for d in range(1, c + 1):
+        for pcs in blocks(c, d):
+            n_sets += pcs.shape[0]
+
+            start = time.perf_counter()
+            forms = normal_forms(pcs, c)
+            vectorized_time += time.perf_counter() - start
+
+            # sample proportionally to the size of the block
+            rows = np.arange(pcs.shape[0])
+            if sample is not None:
+                size = max(1, round(sample * pcs.shape[0] / 2**c))
+                rows = rng.choice(rows, size=min(size, rows.shape[0]), replace=False)
+            start = time.perf_counter()
+            legacy = [legacy_normal_form(pcs[i], c) for i in rows]
+            legacy_time += time.perf_counter() - start
+            n_legacy += rows.shape[0]
+
+            assert all(np.array_equal(f, forms[i]) for f, i in zip(legacy, rows)), d
+
+    per_set = legacy_time / n_legacy
+    print(
+        f"c={c:2d}: {n_sets} sets | vectorized {vectorized_time:.3f}s"
+        f" | legacy {per_set * 1e6:.1f}us/set"
+        f" (~{per_set * n_sets:.1f}s for all, measured on {n_legacy} sets)"
+    )
+
+    if c <= 16:
+        masks = np.arange(1, 2**c, dtype=np.uint64)
+        lookup(masks[:1], c)  # build the table outside of the timing
+        start = time.perf_counter()
+        lookup(masks, c)
+        print(f"       table lookup of all sets {time.perf_counter() - start:.4f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--all-24", action="store_true", help="no sampling for c=24")
+    parser.add_argument("--sample", type=int, default=20000)
+    args = parser.parse_args()
+
+    bench(12)
+    bench(24, sample=None if args.all_24 else args.sample)
@@ -0,0 +1,85 @@
+"""
+Benchmark of batch plotting against one pyplot figure per scale.
+
+The original `plots.plot_polar` created a new pyplot figure for every scale
+and never closed it; `plots.save_all` updates the artists of one Agg figure
+per process. Both runs save the polar plots of the same scales as PNG, and
+the peak memory of each (from ``tracemalloc``) is reported with the time.
+
+Run with ``python benchmarks/bench_plots.py [--c C] [--d D] [--workers N]``.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+
+matplotlib.use("Agg")
+matplotlib.rcParams["figure.max_open_warning"] = 0
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+from mscales import Scales  # noqa: E402
+from mscales.plots import filename, save_all  # noqa: E402
+
+
+def legacy_plot_polar(s, save):
+    c = s.shape[0]
+    _, ax = plt.subplots(subplot_kw={"projection": "polar", "clip_on": False})
+    ax.set_theta_direction(-1)
+    ax.set_theta_zero_location("N")
+    ax.set_yticklabels([])
+    ax.set_ylim(0, 1)
+    plt.thetagrids(np.linspace(0, 360, c, endpoint=False), np.arange(c))
+
+    thetas = [k / c * 2 * np.pi for k in np.argwhere(s > 0)]
+    stems = ax.stem(thetas, np.ones(len(thetas)), linefmt="k", markerfmt="ok")
+    for st in stems:
+        st.set_clip_on(False)
+    plt.setp(stems, "linewidth", 3)
+    plt.setp(stems[0], "markersize", 10)
+    plt.savefig(save)
+
+
+def run(name, render):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as out_dir:
+        n_files = render(out_dir)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(
+        f"{name}: {n_files} files in {seconds:.2f}s"
+        f" ({n_files / seconds:.0f} files/s), peak {peak / 1e6:.0f} MB"
+    )
+
+
+def bench(c, d, workers):
+    scales = Scales(c, d).all()
+
+    def legacy(out_dir):
+        for s in scales:
+            legacy_plot_polar(s, os.path.join(out_dir, filename(s, "polar")))
+        plt.close("all")
+        return len(scales)
+
+    def batch(out_dir):
+        return save_all(scales, out_dir, kind="polar", workers=workers)["files"]
+
+    run("legacy", legacy)
+    run("save_all", batch)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--c", type=int, default=12)
+    parser.add_argument("--d", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    bench(args.c, args.d, args.workers)
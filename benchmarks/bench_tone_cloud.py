@@ -0,0 +1,73 @@
+"""
+Benchmark of tone-cloud MIDI generation against the original implementation.
+
+The original `sound.tone_cloud` built the pitches with list comprehensions and
+one `pretty_midi.Note` per event before serializing. The note arrays of
+`sound.cloud_notes` are written directly by `midi.write`; both produce the
+same bytes.
+
+Run with ``python benchmarks/bench_tone_cloud.py [--files N] [--notes N]``.
+"""
+
+import argparse
+import io
+import time
+
+import numpy as np
+import pretty_midi as pm
+
+from mscales import midi
+from mscales.sound import cloud_notes
+
+DIATONIC = np.isin(np.arange(12), [0, 2, 4, 5, 7, 9, 11]).astype(int)
+
+
+def legacy_tone_cloud(scale, rng, n_notes, note_duration=0.15, velocity=100):
+    starts = np.arange(n_notes) * note_duration
+    ends = starts + note_duration
+    pitches = [x for x in rng.choice(np.nonzero(scale)[0], size=n_notes)]
+    octaves = rng.choice(np.arange(3, 7), size=n_notes)
+    midi_pitches = [(p + 12 * o) for p, o in list(zip(pitches, octaves))]
+
+    cloud = pm.PrettyMIDI()
+    instrument = pm.Instrument(program=0)
+    for mp, s, e in zip(midi_pitches, starts, ends):
+        instrument.notes.append(pm.Note(pitch=mp, velocity=velocity, start=s, end=e))
+    cloud.instruments.append(instrument)
+
+    out = io.BytesIO()
+    cloud.write(out)
+    return out.getvalue()
+
+
+def array_tone_cloud(scale, rng, n_notes):
+    out = io.BytesIO()
+    midi.write(out, cloud_notes(scale, n_notes, rng=rng))
+    return out.getvalue()
+
+
+def bench(n_files, n_notes):
+    timings = {}
+    for name, generate in [("legacy", legacy_tone_cloud), ("arrays", array_tone_cloud)]:
+        start = time.perf_counter()
+        files = [
+            generate(DIATONIC, np.random.default_rng(seed), n_notes)
+            for seed in range(n_files)
+        ]
+        timings[name] = (time.perf_counter() - start, files)
+
+    assert timings["legacy"][1] == timings["arrays"][1]
+    legacy, arrays = timings["legacy"][0], timings["arrays"][0]
+    print(
+        f"{n_files} files x {n_notes} notes: legacy {legacy:.3f}s,"
+        f" arrays {arrays:.3f}s ({legacy / arrays:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--notes", type=int, default=20000)
+    args = parser.parse_args()
+
+    bench(args.files, args.notes)
@@ -1,22 +1,51 @@
 import numpy as np
 from itertools import combinations
 from collections.abc import Iterable
-import matplotlib.pyplot as plt
-import pretty_midi as pm
-from .utils import find_ngrams
-from collections import Counter
+from .utils import (
+    to_mask,
+    from_mask,
+    rotate_mask,
+    reverse_mask,
+    interval_class_vectors,
+    is_DE,
+    is_ME,
+    is_MP,
+    is_CV,
+    binary,
+)
+from .setclasses import MAX_TABLE_C, set_class, forte_name, lookup, normal_forms
+from .cache import memoize
+from .sound import cloud_notes, chord_notes, render
+from .plots import ScaleFigure
 
 rng = np.random.default_rng()
 
 
-class PitchClass:
+class _Immutable:
+    """Forbids setting or deleting attributes once an object is initialized."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} objects are immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} objects are immutable.")
+
+
+class PitchClass(_Immutable):
     """
     Basic pitch-class representation as integers.
     """
 
+    __slots__ = ("p", "c")
+
     def __init__(self, p, c: int = 12):
-        self.c = c
-        self.p = p % self.c
+        object.__setattr__(self, "c", c)
+        object.__setattr__(self, "p", int(p) % c)
+
+    def __reduce__(self):
+        return (PitchClass, (self.p, self.c))
 
     def __repr__(self):
         return f"PitchClass({self.p})"
@@ -29,30 +58,40 @@ class PitchClass:
 
     def __add__(self, other):
         if isinstance(other, PitchClassInterval):
-            return PitchClass((self.p + other.i) % self.c)
+            return PitchClass((self.p + other.i) % self.c, c=self.c)
         else:
             raise TypeError(f"Can't add type {type(other)} to pitch class {self.p}.")
 
     def __sub__(self, other):
         if isinstance(other, PitchClassInterval):
-            return PitchClass((self.p - other.i) % self.c)
+            return PitchClass((self.p - other.i) % self.c, c=self.c)
         else:
             raise TypeError(
                 f"Can't subtract type {type(other)} from pitch class {self.p}."
             )
 
     def __eq__(self, other):
-        return self.p == other.p
+        if isinstance(other, PitchClass):
+            return self.p == other.p and self.c == other.c
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.p, self.c))
 
 
-class PitchClassInterval:
+class PitchClassInterval(_Immutable):
     """
     Interval between two pitch classes.
     """
 
+    __slots__ = ("i", "c")
+
     def __init__(self, i: int, c: int = 12):
-        self.c = c
-        self.i = i
+        object.__setattr__(self, "c", c)
+        object.__setattr__(self, "i", int(i))
+
+    def __reduce__(self):
+        return (PitchClassInterval, (self.i, self.c))
 
     def __repr__(self):
         return f"PitchClassInterval({self.i})"
@@ -62,9 +101,9 @@ class PitchClassInterval:
 
     def __add__(self, other):
         if isinstance(other, PitchClassInterval):
-            return PitchClassInterval((self.i + other.i) % self.c)
+            return PitchClassInterval((self.i + other.i) % self.c, c=self.c)
         elif isinstance(other, PitchClass):
-            return PitchClass((self.i + other.p) % self.c)
+            return PitchClass((self.i + other.p) % self.c, c=self.c)
         else:
             raise TypeError(f"Can't add type {type(other)} to interval {self.i}.")
 
@@ -77,142 +116,142 @@ class PitchClassInterval:
             )
 
     def __eq__(self, other):
-        return self.i == other.i
+        if isinstance(other, PitchClassInterval):
+            return (self.i - other.i) % self.c == 0 and self.c == other.c
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.i % self.c, self.c))
 
 
-class PitchClassSet:
+class PitchClassSet(_Immutable):
     """
     Set of pitch classes.
+
+    Instances are immutable (`pcs` is a read-only array) and hashable, so that
+    they can be used as dictionary keys and set members. Equality and hash are
+    by content (the pitch classes mod `c`), so that all orderings of a set are
+    the same key; compare `pcs` for the order.
     """
 
-    def __init__(self, pcset, c: int = 12):
-        self.c = c
-        self.d = len(pcset)
+    __slots__ = ("pcs", "c", "d", "mask")
 
+    def __init__(self, pcset, c: int = 12):
         if isinstance(pcset, str):
             assert all(
                 x in [str(i) for i in range(10)] + ["T"] + ["E"] for x in list(pcset)
             ), "Some pitch classes are not valid."
-            self.pcs = np.array(
-                [10 if p == "T" else 11 if p == "E" else int(p) for p in list(pcset)]
+            pcs = np.array(
+                [10 if p == "T" else 11 if p == "E" else int(p) for p in list(pcset)],
+                dtype=int,
             )
         elif isinstance(pcset, (Iterable, PitchClassSet)):
-            self.pcs = np.array([int(p) for p in pcset])
+            pcs = np.array([int(p) for p in pcset], dtype=int)
         else:
             raise TypeError(f"I don't recognize the pitch-class input {type(pcset)}.")
 
+        pcs.setflags(write=False)
+        object.__setattr__(self, "pcs", pcs)
+        object.__setattr__(self, "c", c)
+        object.__setattr__(self, "d", len(pcs))
+        # canonical content, shared by all orderings of the same set
+        object.__setattr__(self, "mask", to_mask(pcs % c))
+
+    def __reduce__(self):
+        return (PitchClassSet, (self.pcs.tolist(), self.c))
+
     def __repr__(self):
         return f"PitchClassSet({self.pcs})"
 
     def __str__(self):
-        return str(set(self.pcs))
+        return str(set(self.pcs.tolist()))
 
     def __len__(self):
         return len(self.pcs)
 
+    def __iter__(self):
+        return iter(self.pcs.tolist())
+
     def __eq__(self, other) -> bool:
         if isinstance(other, PitchClassSet):
-            return np.array_equal(self.pcs, other.pcs)
+            return self.c == other.c and self.mask == other.mask
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.mask, self.c))
 
     def sort(self):
-        return PitchClassSet(np.sort(self.pcs))
+        return PitchClassSet(np.sort(self.pcs), c=self.c)
 
     def to_vector(self):
         v = np.zeros(self.c, dtype=int)
         v[self.pcs] += 1
         return v
 
+    def to_bitset(self):
+        """The same set as a `PitchClassBitSet` (for c <= 64)."""
+        return PitchClassBitSet(self.mask, c=self.c)
+
     def transpose(self, n: int):
-        return PitchClassSet((self.pcs + n) % self.c)
+        return PitchClassSet((self.pcs + n) % self.c, c=self.c)
 
     def invert(self, n: int = 0):
-        return PitchClassSet((n - self.pcs) % self.c)
+        return PitchClassSet((n - self.pcs) % self.c, c=self.c)
 
     def complement(self):
-        return PitchClassSet(np.setdiff1d(np.arange(self.c), self.pcs))
+        return PitchClassSet(np.setdiff1d(np.arange(self.c), self.pcs), c=self.c)
 
-    def normal_form(self):
+    @memoize
+    def normal_form(self, method: str = "rahn"):
         """
         Bring pitch-class set in normal form according to description at:
         https://musictheory.pugetsound.edu/mt21c/NormalForm.html
-        """
 
-        self = self.sort()
+        Args:
+            method (str, optional): Tie-breaking rules after "rahn" or "forte".
+                Defaults to "rahn", which is a lookup in the set-class table
+                for c <= 16 (see `mscales.setclasses`).
+        """
 
         if len(self.pcs) == 0:
-            raise "PitchClassSet is empty!"
-        elif len(self.pcs) == 1:
-            return self
+            raise ValueError("PitchClassSet is empty!")
+
+        pcs = np.unique(self.pcs % self.c)
+        if method == "rahn" and self.c <= MAX_TABLE_C:
+            start = set_class(self.mask, self.c)[3]
+            pcs = np.roll(pcs, -np.searchsorted(pcs, start))
         else:
-            rotations = np.array(
-                [np.roll(self.pcs, i) for i in range(self.pcs.shape[0])]
-            )
-            for length in range(self.d - 1, 0, -1):
-                spans = [(r[-1] - r[0]) % self.c for r in rotations[:, : length + 1]]
-                mask = spans == min(spans)
-                min_span_rotations = rotations[mask]
-
-                # if there is a tie in the first step and we want to obtain all candidates
-                # if there is only one candidate left
-                if min_span_rotations.shape[0] == 1:
-                    return PitchClassSet(min_span_rotations.flatten())
-                # (if there are more than one)
-                elif min_span_rotations.shape[0] > 1:  # (length == self.d - 1) and
-                    rotations = min_span_rotations
-                else:
-                    raise "Something went wrong!"
-
-                # if there is an absolute tie, chose the one with smaller first element
-            if min_span_rotations.shape[0] > 1:
-                min_idx = np.argmin(min_span_rotations, axis=0)[0]
-                return PitchClassSet(min_span_rotations[min_idx])
+            pcs = normal_forms(pcs, self.c, method=method)
+
+        return PitchClassSet(pcs, c=self.c)
 
+    @memoize
     def prime_form(self):
         """Prime form of the pitch-class set, after Rahn.
         See also: https://ianring.com/musictheory/scales/#primeform
+
+        Forte (1973) packs the set classes 5-20, 6-Z29, 6-31, 7-20 and 8-26
+        differently; use `forte_name` to identify set classes by Forte's names.
         """
 
         if len(self.pcs) == 0:
             return "PitchClassSet is empty!"
-        elif len(self.pcs) == 1:
-            # TODO: transoposition should know whether it operates
-            # on Pitches, PitchSets, or PitchClass sets, and take the modulo
-            # from the Class
-            return self.transpose(-self.pcs[0] % self.c)
-
-        normal = self.normal_form()
-        transposed = normal.transpose(-normal.pcs[0])
-        candidate1 = transposed
-
-        inverted = transposed.invert()
-        sorted = inverted.sort()
-
-        candidate2 = sorted.normal_form().transpose(-sorted.normal_form().pcs[0])
-
-        try:
-            if np.less_equal(candidate1.pcs, candidate2.pcs).all():
-                return candidate1
-            elif np.less_equal(candidate2.pcs, candidate1.pcs).all():
-                return candidate2
-        except Exception as e:
-            return e
-
-        # The following special cases were taken from https://ianring.com/
-        # TODO: Implement special cases!
-        # // Special set classes:
-        # // Forte  Prime form packed    Prime form packed
-        # // name   from the right       to the left
-        # // ----------------------------------------------
-        # // 5-20      (01568)           (01378)
-        # // 6-Z29     (023679)          (013689)
-        # // 6-31      (014579)          (013589)
-        # // 7-20      (0125679)         (0124789)
-        # // 8-26      (0134578T)        (0124579T)
 
+        prime = set_class(self.mask, self.c)[0]
+
+        return PitchClassSet(from_mask(prime, self.c), c=self.c)
+
+    @memoize
+    def forte_name(self):
+        """Forte name of the set class, e.g. '3-11' (None unless c = 12)."""
+        return forte_name(self.mask, self.c)
+
+    @memoize
     def interval_vector(self):
-        half = int(np.ceil(self.c / 2))
-        intervals = [(b - a) % self.c for a, b in list(combinations(self.pcs, r=2))]
-        interval_classes = [i if i <= half else self.c - i for i in intervals]
+        half = self.c // 2
+        pcs = np.unique(self.pcs % self.c)
+        intervals = [(b - a) % self.c for a, b in list(combinations(pcs, r=2))]
+        interval_classes = [min(i, self.c - i) for i in intervals]
 
         iv = np.zeros(half, dtype=int)
         for i in interval_classes:
@@ -220,24 +259,26 @@ class PitchClassSet:
 
         return iv
 
+    @memoize
     def maximally_even(self):
         """
-        Calculates all maximally even sets for chromatic cardinality c
-        and diatonic cardinality d.
+        Tests whether the set is maximally even, i.e. a J-function set
+        for chromatic cardinality c and diatonic cardinality d
+        (see `mscales.utils.is_ME`).
         """
 
-        D = [
-            [np.floor((self.c * k + m) / self.d).astype(int) for k in range(self.d)]
-            for m in range(self.c)
-        ]
-        D = [np.array(s) for s in set(tuple(i) for i in D)]
+        return is_ME(binary(np.unique(self.pcs % self.c), self.c))
 
-        for s in D:
-            if set(s) == set(self.pcs):
-                return True
-            else:
-                return False
+    @memoize
+    def distributionally_even(self):
+        """
+        Tests whether each generic interval of the set comes in one or two
+        specific sizes (see `mscales.utils.is_DE`).
+        """
 
+        return is_DE(binary(np.unique(self.pcs % self.c), self.c))
+
+    @memoize
     def spectrum(self, i):
         """
         Returns the spectrum of generic interval i,
@@ -248,41 +289,31 @@ class PitchClassSet:
             self.d
         ), f"Generic interval i={i} has to be between 0 and {self.d-1}."
 
-        return {(k - j) % self.c for j, k in zip(self.pcs, np.roll(self.pcs, -i))}
+        pcs = np.unique(self.pcs % self.c)
+        return {(k - j) % self.c for j, k in zip(pcs, np.roll(pcs, -i))}
 
+    @memoize
     def myhill(self):
         """
         Returns whether pitch-class set has Myhill's property.
         """
 
-        specs = set([len(self.spectrum(i=i)) for i in range(1, self.d)])
-
-        return True if specs == {2} else False
+        return is_MP(binary(np.unique(self.pcs % self.c), self.c))
 
+    @memoize
     def cardinality_equals_variety(self):
         """
         Tests if cardinality equals variety holds for PCSet.
         See: https://en.wikipedia.org/wiki/Cardinality_equals_variety
         """
 
-        for n in range(2, self.d + 1):
-            s = np.append(self.pcs, self.pcs[: n - 1])
-            ngrams = find_ngrams(s, n=n)
-            intervals = [
-                "".join(
-                    [str((gram[i] - gram[i - 1]) % 12) for i in range(1, len(gram))]
-                )
-                for gram in ngrams
-            ]
-            if n != len(Counter(intervals)):
-                return False
-        return True
+        return is_CV(binary(np.unique(self.pcs % self.c), self.c))
 
     def sum(self) -> int:
         return sum(self.pcs)
 
     def retrograde(self):
-        return PitchClassSet(np.flip(self.pcs))
+        return PitchClassSet(np.flip(self.pcs), c=self.c)
 
     def inversion(self):
         """This is different from `self.invert` !!"""
@@ -295,48 +326,19 @@ class PitchClassSet:
         """This function offers various means for visualizing pitch-class sets.
 
         Args:
-            kind (str, optional): What kind of visualization, see documentation for examples. Defaults to "area".
+            kind (str, optional): What kind of visualization: "area", "lollipop" or "bar". Defaults to "area".
             save (bool/str, optional): Given a file path, will try to save the figure at this location. Defaults to False.
 
         Returns:
             plt.axis: _matplotlib_ axis object
         """
+        import matplotlib.pyplot as plt
 
-        if kind == "bar":
-            _, ax = plt.subplots()
-            ax.bar(np.arange(self.c), self.to_vector(), color="k")
-            ax.set(xlabel="Pitch class", yticks=[], ylim=(0, 1))
-            return ax
-
-        _, ax = plt.subplots(subplot_kw={"projection": "polar", "clip_on": False})
-        ax.set_theta_direction(-1)
-        ax.set_theta_zero_location("N")
-        ax.set_yticklabels([])
-        ax.set_ylim(0, 1)
-        plt.thetagrids(np.linspace(0, 360, self.c, endpoint=False), np.arange(self.c))
-
-        # data
-        thetas = [k / self.c * 2 * np.pi for k in np.flatnonzero(self.to_vector())]
-        radii = [1 for _ in range(len(thetas))]
-
-        if kind == "lollipop":
-            stems = ax.stem(thetas, radii, linefmt="k", markerfmt="ok")
-            for st in stems:
-                st.set_clip_on(False)
-            plt.setp(stems, "linewidth", 3)
-            plt.setp(stems[0], "markersize", 10)
-            return ax
-        elif kind == "area":
-            thetas += thetas[:1]
-            radii += radii[:1]
-            ax.plot(thetas, radii, c="k", zorder=5)
-            ax.fill(thetas, radii, alpha=0.75, zorder=4)
-        else:
-            print(
-                "I don't recognize the plot kind." "Valid values are 'polar' and 'bar'."
-            )
+        kind = {"bar": "barcode", "lollipop": "polar"}.get(kind, kind)
+        figure = ScaleFigure(self.c, kind, plt.figure()).update(self.to_vector())
         if save:
-            plt.savefig(save)
+            figure.save(save)
+        return figure.ax
 
     def play(
         self,
@@ -346,53 +348,32 @@ class PitchClassSet:
         velocity: int = 100,
         instrument_name: str = "Acoustic Grand Piano",
         save_as: str = None,
+        pretty: bool = True,
+        tuning: str = "bend",
     ):
+        """
+        Plays the set as a tone cloud of `n_notes` random pitches or as a chord.
+
+        The MIDI file is written straight from the note arrays if `save_as` is
+        given. Otherwise a `pretty_midi.PrettyMIDI` object is returned, or the
+        `Notes` themselves if `pretty` is False. Sets of c-EDO are tuned by
+        pitch-bend or by MIDI Tuning Standard messages (`tuning` "mts").
+        """
+        assert mode in ("cloud", "chord"), f"Unknown mode {mode}."
 
         if mode == "cloud":
-            starts = np.arange(n_notes) * note_duration  # onsets
-            ends = starts + note_duration  # offsets
-
-            pitches = [
-                x for x in rng.choice(np.nonzero(self.to_vector())[0], size=n_notes)
-            ]
-            octaves = rng.choice(np.arange(3, 7), size=n_notes)
-            midi_pitches = [(p + 12 * o) for p, o in list(zip(pitches, octaves))]
-        elif mode == "chord":
-            pitches = self.pcs
-            octaves = [4] * pitches.shape[0]
-            midi_pitches = [(p + 12 * o) for p, o in list(zip(pitches, octaves))]
-
-            starts = [0] * pitches.shape[0]
-            ends = [note_duration] * pitches.shape[0]
-
-        # Create a PrettyMIDI object
-        midi = pm.PrettyMIDI()
-
-        # Create an Instrument instance for an instrument
-        assert (
-            instrument_name in pm.constants.INSTRUMENT_MAP
-        ), f"Instrument must be in {pm.constants.INSTRUMENT_MAP}"
-        # instrument_code = pm.constants.INSTRUMENT_MAP.index(instrument_name)
-
-        program = pm.instrument_name_to_program(instrument_name)
-        instrument = pm.Instrument(program=program)
-
-        for mp, s, e in zip(midi_pitches, starts, ends):
-            # Create a Note instance for this note, starting at `s` and ending at `e`.
-            note = pm.Note(pitch=mp, velocity=velocity, start=s, end=e)
-            # Add it to instrument
-            instrument.notes.append(note)
-
-        # Add the instrument to the PrettyMIDI object
-        midi.instruments.append(instrument)
-
-        if save_as is not None:
-            midi.write(save_as)
+            notes = cloud_notes(self.to_vector(), n_notes, note_duration, velocity, rng)
         else:
-            return midi
+            notes = chord_notes(self.pcs, note_duration, velocity, self.c)
+
+        return render(notes, instrument_name, save_as, pretty, tuning)
 
     def info(self):
-        """Returns all sorts of information on the PitchClassSet."""
+        """Returns all sorts of information on the PitchClassSet.
+
+        The set-theoretic and diatonic properties are memoized by set (see
+        `mscales.cache`), so repeated calls for recurring sets are cheap.
+        """
         tab = "\n\t\t  "
         s = "=" * len(repr(self)) + "\n"
         s += repr(self) + "\n"
@@ -408,11 +389,13 @@ class PitchClassSet:
         s += f"T2I\t\t: {self.invert(2)}" + "\n"
         s += f"normal form\t: {self.normal_form()}" + "\n"
         s += f"prime form\t: {self.prime_form()}" + "\n"
+        s += f"Forte name\t: {self.forte_name()}" + "\n"
         s += f"interval vector\t: {self.interval_vector()}" + "\n\n"
 
         s += "Diatonic Scale Theory" + "\n"
         s += "=====================" + "\n"
         s += f"Maximally even: {str(self.maximally_even())}" + "\n"
+        s += f"Distributionally even: {str(self.distributionally_even())}" + "\n"
         s += f"Spectrum (step): {str(self.spectrum(i=1))}" + "\n"
         s += f"Myhill's property: {str(self.myhill())}" + "\n"
         s += (
@@ -431,6 +414,211 @@ class PitchClassSet:
         return s
 
 
+class PitchClassBitSet(_Immutable):
+    """
+    Set of pitch classes stored as a single integer bitmask (for c <= 64).
+
+    Bit p stands for pitch class p: transposition is a bit rotation, inversion
+    a bit reversal followed by a rotation, and the complement an XOR with the
+    aggregate. Equality and hashing compare the integers.
+    """
+
+    __slots__ = ("mask", "c")
+
+    def __init__(self, pcset, c: int = 12):
+        assert 0 < c <= 64, f"Bitmasks hold at most 64 pitch classes, got c={c}."
+
+        if isinstance(pcset, (int, np.integer)):
+            mask = int(pcset) & ((1 << c) - 1)
+        elif isinstance(pcset, PitchClassBitSet):
+            mask = pcset.mask
+        else:
+            mask = PitchClassSet(pcset, c=c).mask
+
+        object.__setattr__(self, "mask", mask)
+        object.__setattr__(self, "c", c)
+
+    def __reduce__(self):
+        return (PitchClassBitSet, (self.mask, self.c))
+
+    def __repr__(self):
+        return f"PitchClassBitSet({self.pcs})"
+
+    def __str__(self):
+        return str(set(self.pcs.tolist()))
+
+    def __len__(self):
+        return self.mask.bit_count()
+
+    def __iter__(self):
+        return iter(self.pcs.tolist())
+
+    def __contains__(self, p) -> bool:
+        return bool((self.mask >> (int(p) % self.c)) & 1)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PitchClassBitSet):
+            return self.mask == other.mask and self.c == other.c
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.mask, self.c))
+
+    @property
+    def pcs(self) -> np.ndarray:
+        return from_mask(self.mask, self.c)
+
+    @property
+    def d(self) -> int:
+        return len(self)
+
+    def sort(self):
+        return self
+
+    def to_vector(self):
+        bits = np.uint64(self.mask) >> np.arange(self.c, dtype=np.uint64)
+        return (bits & np.uint64(1)).astype(int)
+
+    def to_pcset(self):
+        return PitchClassSet(self.pcs, c=self.c)
+
+    def transpose(self, n: int):
+        return PitchClassBitSet(rotate_mask(self.mask, n, self.c), c=self.c)
+
+    def invert(self, n: int = 0):
+        inverted = rotate_mask(reverse_mask(self.mask, self.c), n + 1, self.c)
+        return PitchClassBitSet(inverted, c=self.c)
+
+    def complement(self):
+        return PitchClassBitSet(self.mask ^ ((1 << self.c) - 1), c=self.c)
+
+    def prime_form(self):
+        """Prime form of the pitch-class set, after Rahn (see `PitchClassSet`)."""
+        return PitchClassBitSet(set_class(self.mask, self.c)[0], c=self.c)
+
+    def forte_name(self):
+        """Forte name of the set class, e.g. '3-11' (None unless c = 12)."""
+        return forte_name(self.mask, self.c)
+
+
+class PitchClassSetArray(_Immutable):
+    """
+    Batch of pitch-class sets, stored as one (n_sets x c) boolean matrix.
+
+    The transformations and set-class computations of `PitchClassSet` act on
+    all sets of the batch at once.
+    """
+
+    __slots__ = ("vectors", "c")
+
+    def __init__(self, vectors):
+        vectors = np.array(vectors, dtype=bool, ndmin=2)
+        vectors.setflags(write=False)
+        object.__setattr__(self, "vectors", vectors)
+        object.__setattr__(self, "c", vectors.shape[1])
+
+    @classmethod
+    def from_pcsets(cls, pcsets, c: int = 12):
+        """Batch of a list of `PitchClassSet` objects (or iterables of pcs)."""
+        pcs = [np.asarray(list(s), dtype=int) % c for s in pcsets]
+        vectors = np.zeros((len(pcs), c), dtype=bool)
+        rows = np.repeat(np.arange(len(pcs)), [len(p) for p in pcs])
+        vectors[rows, np.concatenate(pcs or [np.zeros(0, dtype=int)])] = True
+        return cls(vectors)
+
+    @classmethod
+    def from_masks(cls, masks, c: int = 12):
+        """Batch of sets given as bitmasks (bit p stands for pitch class p)."""
+        shifts = np.arange(c, dtype=np.uint64)
+        masks = np.asarray(masks, dtype=np.uint64)
+        return cls(((masks[:, None] >> shifts) & np.uint64(1)).reshape(-1, c))
+
+    def to_pcsets(self):
+        """List of the sets as `PitchClassSet` objects."""
+        return [PitchClassSet(np.flatnonzero(v), c=self.c) for v in self.vectors]
+
+    def __repr__(self):
+        return f"PitchClassSetArray(n_sets={len(self)}, c={self.c})"
+
+    def __len__(self):
+        return self.vectors.shape[0]
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return PitchClassSet(np.flatnonzero(self.vectors[key]), c=self.c)
+        return PitchClassSetArray(self.vectors[key].reshape(-1, self.c))
+
+    def __iter__(self):
+        return iter(self.to_pcsets())
+
+    @property
+    def d(self) -> np.ndarray:
+        return self.vectors.sum(axis=1)
+
+    @property
+    def masks(self) -> np.ndarray:
+        assert self.c <= 64, "Bitmasks hold at most 64 pitch classes."
+        shifts = np.arange(self.c, dtype=np.uint64)
+        return (self.vectors.astype(np.uint64) << shifts).sum(axis=1, dtype=np.uint64)
+
+    def to_vector(self):
+        return self.vectors.astype(int)
+
+    def transpose(self, n: int):
+        return PitchClassSetArray(np.roll(self.vectors, n, axis=1))
+
+    def invert(self, n: int = 0):
+        return PitchClassSetArray(self.vectors[:, (n - np.arange(self.c)) % self.c])
+
+    def complement(self):
+        return PitchClassSetArray(~self.vectors)
+
+    def interval_vector(self):
+        return interval_class_vectors(self.vectors.astype(np.uint8))
+
+    def normal_form(self, method: str = "rahn"):
+        """
+        Normal forms of all sets (see `PitchClassSet.normal_form`).
+
+        Parameters
+        ----------
+        method : str, optional
+            tie-breaking rules after "rahn" or "forte", by default "rahn"
+
+        Returns
+        -------
+        np.ndarray
+            (n_sets x max(d)) matrix of pitch classes in normal order; rows of
+            sets with fewer pitch classes are padded with -1
+        """
+        use_table = method == "rahn" and self.c <= MAX_TABLE_C
+        if use_table:
+            starts = lookup(self.masks, self.c)[3]
+        d = self.d
+        forms = np.full((len(self), d.max(initial=0)), -1, dtype=int)
+
+        for k in np.unique(d[d > 0]):
+            rows = np.flatnonzero(d == k)
+            pcs = np.nonzero(self.vectors[rows])[1].reshape(-1, k)
+            if use_table:
+                shift = (pcs < starts[rows, None]).sum(axis=1)
+                index = (np.arange(k) + shift[:, None]) % k
+                forms[rows, :k] = np.take_along_axis(pcs, index, axis=1)
+            else:
+                forms[rows, :k] = normal_forms(pcs, self.c, method=method)
+
+        return forms
+
+    def prime_form(self):
+        """Prime forms of all sets, after Rahn (see `PitchClassSet.prime_form`)."""
+        return PitchClassSetArray.from_masks(lookup(self.masks, self.c)[0], c=self.c)
+
+    def forte_name(self):
+        """Forte names of the set classes of all sets (None unless c = 12)."""
+        primes = lookup(self.masks, self.c)[0]
+        return [forte_name(int(p), self.c) for p in primes]
+
+
 if __name__ == "__main__":
 
     # test cases from https://musictheory.pugetsound.edu/mt21c/PrimeForm.html
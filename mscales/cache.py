@@ -0,0 +1,105 @@
+import numpy as np
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entries.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        maximal number of entries, None for no bound and 0 to disable
+        caching, by default 65536
+    """
+
+    def __init__(self, maxsize: int = 65536):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, compute):
+        """Value stored under `key`, calling `compute()` to fill it on a miss."""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            if self.maxsize != 0:
+                self._entries[key] = value
+                self._evict()
+            return value
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def resize(self, maxsize: int):
+        """Change the bound, evicting entries if needed."""
+        self.maxsize = maxsize
+        self._evict()
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def _evict(self):
+        if self.maxsize is not None:
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+# shared by all memoized pitch-class-set analytics
+analysis_cache = LRUCache()
+
+
+def memoize(method):
+    """
+    Memoizes a method of pitch-class sets in `analysis_cache`.
+
+    Results are keyed by the canonical content of the set, its bitmask and
+    chromatic cardinality (``self.mask``, ``self.c``), so they are shared by
+    all objects (and orderings) of the same set. Sets that repeat pitch
+    classes (``self.d`` above the number of bits of the mask) are keyed by
+    their sorted pitch classes instead. Mutable results are copied on the way
+    out to keep the cached values intact.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        content = self.mask
+        if self.d != bin(self.mask).count("1"):
+            content = tuple(np.sort(np.asarray(self.pcs) % self.c).tolist())
+        key = (content, self.c, method.__name__, args, tuple(sorted(kwargs.items())))
+        value = analysis_cache.get(key, lambda: method(self, *args, **kwargs))
+        if isinstance(value, (np.ndarray, set, list, dict)):
+            return value.copy()
+        return value
+
+    return wrapper
+
+
+def cache_info() -> CacheInfo:
+    """Hits, misses, bound and size of the analysis cache."""
+    return analysis_cache.info()
+
+
+def set_cache_size(maxsize: int):
+    """Bound the analysis cache to `maxsize` entries (None: unbounded, 0: off)."""
+    analysis_cache.resize(maxsize)
+
+
+def clear_cache():
+    """Empty the analysis cache and reset its statistics."""
+    analysis_cache.clear()
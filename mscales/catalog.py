@@ -0,0 +1,261 @@
+"""
+On-disk catalog of all scales of a universe.
+
+A catalog is a directory of ``.npy`` files, one per column, with one row per
+scale in the order of ``Scales(c, d).all()``, and a ``catalog.json`` with the
+universe and the shape and dtype of the columns:
+
+- ``mask``: bitmask of the scale (bit p for pitch class p)
+- ``d``: number of pitch classes
+- ``prime_id``: row of the set class of the scale in the class columns
+- ``interval_vector``: interval-class vector (interval classes 1 to c // 2)
+- ``DE``, ``ME``, ``MP``, ``CV``, ``G``: distributionally even, maximally
+  even, Myhill's property, cardinality equals variety and generated
+
+The set classes have columns of their own, in increasing order of their
+prime form: ``prime`` (bitmask of the prime form after Rahn), ``forte``
+(Forte name, empty outside of c = 12) and ``size`` (number of scales).
+
+The catalog is built once, in blocks of scales that are processed by a pool
+of worker processes and written straight into the files. Columns are then
+loaded with ``np.load(mmap_mode="r")`` when first accessed: opening a catalog
+reads no scales, and all processes that open it share the same pages of the
+operating system's file cache.
+"""
+
+import json
+import os
+from math import comb
+
+import numpy as np
+
+from .scales import Scales, _unpack
+from .setclasses import forte_name, lookup
+from .utils import (
+    interval_class_vectors,
+    is_CV,
+    is_DE,
+    is_G,
+    is_ME,
+    is_MP,
+    map_chunks,
+    reverse_mask,
+    to_masks,
+)
+
+# flags of the scale properties, in the order of their columns
+PROPERTIES = ("DE", "ME", "MP", "CV", "G")
+
+METADATA = "catalog.json"
+
+
+class Catalog:
+    """
+    A catalog built by `build`, with its columns memory-mapped on first use.
+
+    Parameters
+    ----------
+    directory : str
+        directory of the catalog
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, METADATA)) as f:
+            self.metadata = json.load(f)
+        self.c = self.metadata["c"]
+        self.d = self.metadata["d"]
+        self._columns = {}
+
+    def __len__(self):
+        return self.metadata["n_scales"]
+
+    def __contains__(self, name):
+        return name in self.metadata["columns"]
+
+    def __getitem__(self, name) -> np.ndarray:
+        """The (read-only, memory-mapped) column `name`."""
+        if name not in self._columns:
+            if name not in self:
+                raise KeyError(f"No column {name!r} in the catalog.")
+            path = os.path.join(self.directory, f"{name}.npy")
+            self._columns[name] = np.load(path, mmap_mode="r")
+        return self._columns[name]
+
+    @property
+    def columns(self):
+        return tuple(self.metadata["columns"])
+
+    def rows(self, masks) -> np.ndarray:
+        """
+        Rows of the scales with bitmasks `masks` (bit p for pitch class p).
+
+        Raises
+        ------
+        ValueError
+            if a bitmask is not in the universe of the catalog
+        """
+        masks = np.asarray(masks, dtype=np.uint64)
+        if (masks >> np.uint64(self.c)).any():
+            raise ValueError(f"Bitmasks out of the universe of c={self.c}.")
+
+        # the scales are in increasing order of their reversed bitmask, which
+        # is their rank (for a fixed d, in the combinatorial number system)
+        bits = reverse_mask(masks, self.c)
+        if self.d is None:
+            return bits.astype(np.int64)
+
+        ranks = np.zeros(masks.shape, dtype=np.int64)
+        i = np.zeros(masks.shape, dtype=np.int64)
+        for b in range(self.c):
+            bit = ((bits >> np.uint64(b)) & np.uint64(1)).astype(bool)
+            i += bit
+            combs = np.array([comb(b, k) for k in range(self.d + 1)], dtype=np.int64)
+            ranks += np.where(bit, combs[np.minimum(i, self.d)], 0)
+
+        if (i != self.d).any():
+            raise ValueError(f"Bitmasks without {self.d} pitch classes.")
+        return ranks
+
+    def scales(self, rows=slice(None)) -> np.ndarray:
+        """Binary vectors of the scales at `rows`, as in ``Scales.all``."""
+        masks = np.atleast_1d(self["mask"][rows])
+        return _unpack(reverse_mask(masks, self.c), self.c)
+
+    def forte_names(self, rows=slice(None)) -> np.ndarray:
+        """Forte names of the scales at `rows` (empty outside of c = 12)."""
+        return self["forte"][self["prime_id"][rows]]
+
+
+def _columns(c: int, d: int, n: int, n_classes: int) -> dict:
+    """dtype and shape of each column."""
+    return {
+        "mask": ("<u8", [n]),
+        "d": ("u1", [n]),
+        "prime_id": ("<i4", [n]),
+        "interval_vector": ("u1", [n, c // 2]),
+        **{name: ("|b1", [n]) for name in PROPERTIES},
+        "prime": ("<u8", [n_classes]),
+        "forte": ("<U6", [n_classes]),
+        "size": ("<i8", [n_classes]),
+    }
+
+
+def _block(bounds, c: int, d: int) -> tuple:
+    """Columns of the scales with rows `bounds[0]` to `bounds[1]` - 1."""
+    start, stop = bounds
+    scales = _unpack(Scales(c, d)._masks(start, stop), c)
+    columns = {
+        "mask": to_masks(scales),
+        "d": scales.sum(axis=1),
+        "prime": lookup(to_masks(scales), c)[0],
+        "interval_vector": interval_class_vectors(scales),
+        "DE": is_DE(scales),
+        "ME": is_ME(scales),
+        "MP": is_MP(scales),
+        "CV": is_CV(scales),
+        "G": is_G(scales),
+    }
+    return start, stop, columns
+
+
+def build(
+    directory,
+    c: int = 12,
+    d=None,
+    block_size: int = 65536,
+    workers: int = None,
+) -> Catalog:
+    """
+    Builds the catalog of all scales of chromatic cardinality `c` (with `d`
+    pitch classes, if given) in `directory`.
+
+    The columns are written under temporary names and renamed when they are
+    complete, and ``catalog.json`` last, so that a catalog is never read
+    while it is incomplete.
+
+    Parameters
+    ----------
+    directory : str
+        directory of the catalog, created if needed
+    c : int, optional
+        chromatic cardinality (at most 64), by default 12
+    d : int, optional
+        diatonic cardinality, by default None (all scales)
+    block_size : int, optional
+        number of scales per block, by default 65536
+    workers : int, optional
+        number of worker processes, by default ``os.cpu_count()``
+
+    Returns
+    -------
+    Catalog
+        the new catalog
+    """
+    universe = Scales(c, d)
+    n = universe._count()
+    primes, sizes = universe.bracelets()
+    primes = to_masks(primes)
+    order = np.argsort(primes)
+    primes, sizes = primes[order], sizes[order]
+
+    os.makedirs(directory, exist_ok=True)
+    metadata = os.path.join(directory, METADATA)
+    if os.path.exists(metadata):
+        os.remove(metadata)
+
+    columns = _columns(c, d, n, primes.shape[0])
+    tmp = {
+        name: os.path.join(directory, f"{name}.{os.getpid()}.tmp.npy")
+        for name in columns
+    }
+    files = {
+        name: np.lib.format.open_memmap(tmp[name], "w+", dtype, tuple(shape))
+        for name, (dtype, shape) in columns.items()
+    }
+
+    files["prime"][:] = primes
+    files["size"][:] = sizes
+    if c == 12:
+        files["forte"][:] = [forte_name(int(p)) or "" for p in primes]
+
+    blocks = ((start, min(start + block_size, n)) for start in range(0, n, block_size))
+    for start, stop, block in map_chunks(_block, blocks, workers, c, d):
+        block["prime_id"] = np.searchsorted(primes, block.pop("prime"))
+        for name, values in block.items():
+            files[name][start:stop] = values
+
+    for array in files.values():
+        array.flush()
+    files.clear()
+    for name in columns:
+        os.replace(tmp[name], os.path.join(directory, f"{name}.npy"))
+
+    with open(f"{metadata}.{os.getpid()}.tmp", "w") as f:
+        json.dump(
+            {
+                "c": c,
+                "d": d,
+                "n_scales": n,
+                "n_classes": int(primes.shape[0]),
+                "properties": list(PROPERTIES),
+                "columns": columns,
+            },
+            f,
+            indent=2,
+        )
+    os.replace(f"{metadata}.{os.getpid()}.tmp", metadata)
+    return Catalog(directory)
+
+
+def catalog(directory, c: int = 12, d=None, **kwargs) -> Catalog:
+    """
+    The catalog of the universe (`c`, `d`) in `directory`, built there (see
+    `build`) unless a complete catalog of that universe is already present.
+    """
+    path = os.path.join(directory, METADATA)
+    if os.path.exists(path):
+        loaded = Catalog(directory)
+        if (loaded.c, loaded.d) == (c, d):
+            return loaded
+    return build(directory, c, d, **kwargs)
@@ -1,4 +1,7 @@
-from concepts import Context
+import numpy as np
+from functools import lru_cache
+from .scales import Scales
+from .utils import generators, interval_class_vectors, is_ME, spectra, to_masks
 
 # table below taken from Noll (2016)
 
@@ -19,6 +22,157 @@ lattice = """
 13|X|  |  |  |  |  |  |
 """
 
-c = Context.fromstring(lattice)
-# print(c.intension(["MP", "DT"]))
-# print(c.lattice.graphviz(view=True))
+
+@lru_cache(maxsize=None)
+def noll_context():
+    """The context of Noll (2016), parsed from `lattice` on first use."""
+    from concepts import Context
+
+    return Context.fromstring(lattice)
+
+
+def __getattr__(name):
+    # the context used to be built at import as `c`
+    if name == "c":
+        return noll_context()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# print(noll_context().intension(["MP", "DT"]))
+# print(noll_context().lattice.graphviz(view=True))
+
+# scale properties of Noll (2016), in the order of the columns above
+PROPERTIES = ("G", "DE", "ME", "MP", "DP", "BZ", "DT")
+
+
+def scale_properties(s: np.ndarray) -> np.ndarray:
+    """
+    Evaluates the properties of Noll (2016) for a scale or a matrix of scales.
+
+    G: generated, i.e. a transposition of d consecutive multiples of some
+    generator g; DE: distributionally even, every generic interval comes in at
+    most two specific sizes; ME: maximally even; MP: Myhill's property; DP:
+    deep, all interval classes occur with different multiplicities; BZ:
+    Balzano scale, c = k(k + 1) with d = 2k + 1 generated by 2k + 1; DT:
+    maximally even with c = 2(d - 1).
+
+    Parameters
+    ----------
+    s : np.ndarray
+        scale of length c, or (n_scales x c) matrix of scales (c <= 64)
+
+    Returns
+    -------
+    np.ndarray
+        boolean vector (or n_scales x 7 matrix) with one column per property
+        in `PROPERTIES`
+    """
+    s = np.asarray(s)
+    scales = np.atleast_2d(s) > 0
+    c = scales.shape[1]
+    d = scales.sum(axis=1)
+
+    by_generator = generators(scales)[0]
+    generated = by_generator.any(axis=1)
+
+    sizes, _ = spectra(scales)
+    generic = (np.arange(c) < d[:, None])[:, 1:]
+    de = ((sizes[:, 1:] <= 2) | ~generic).all(axis=1) & (d > 0)
+    mp = ((sizes[:, 1:] == 2) | ~generic).all(axis=1) & (d > 1)
+
+    me = is_ME(scales)
+
+    icv = np.sort(interval_class_vectors(scales), axis=1)
+    deep = (np.diff(icv, axis=1) != 0).all(axis=1)
+
+    k = int(np.sqrt(c))
+    balzano = np.zeros_like(generated)
+    if k * (k + 1) == c:
+        balzano = by_generator[:, 2 * k + 1] & (d == 2 * k + 1)
+
+    diatonic = me & (c == 2 * (d - 1))
+
+    properties = np.stack([generated, de, me, mp, deep, balzano, diatonic], axis=1)
+    return properties if s.ndim > 1 else properties[0]
+
+
+def signatures(c: int = 12, d=None, block_size: int = 65536):
+    """
+    Distinct property signatures of all scales of a universe.
+
+    The scales are streamed in blocks of `block_size`, and only a counter and
+    a representative per signature are kept, so that memory is bounded by
+    the number of signatures (at most 2**7) rather than of scales.
+
+    Parameters
+    ----------
+    c : int, optional
+        chromatic cardinality (at most 64), by default 12
+    d : int, optional
+        diatonic cardinality, by default None (all scales)
+    block_size : int, optional
+        number of scales per block, by default 65536
+
+    Returns
+    -------
+    tuple
+        (n_signatures x 7) boolean matrix of signatures, the number of scales
+        with each signature and the bitmask of the first such scale; sorted
+        by decreasing number of properties
+    """
+    weights = 1 << np.arange(len(PROPERTIES))
+    counts = np.zeros(2 ** len(PROPERTIES), dtype=np.int64)
+    representatives = {}
+
+    for scales in Scales(c, d).iter_all(block_size):
+        codes = scale_properties(scales) @ weights
+        counts += np.bincount(codes, minlength=counts.shape[0])
+
+        new, first = np.unique(codes, return_index=True)
+        masks = to_masks(scales[first])
+        for code, mask in zip(new, masks):
+            representatives.setdefault(int(code), int(mask))
+
+    codes = np.flatnonzero(counts)
+    bools = (codes[:, None] & weights) > 0
+    order = np.lexsort((codes, -bools.sum(axis=1)))
+    codes, bools = codes[order], bools[order]
+
+    return (
+        bools,
+        counts[codes],
+        np.array([representatives[code] for code in codes], dtype=np.uint64),
+    )
+
+
+def property_context(c: int = 12, d=None, block_size: int = 65536):
+    """
+    Formal context of the properties of Noll (2016) over a universe of scales.
+
+    Each object is one property signature that occurs in the universe, named
+    after the pitch classes of a representative scale. The concept lattice is
+    then available as ``context.lattice``.
+
+    Parameters
+    ----------
+    c : int, optional
+        chromatic cardinality (at most 64), by default 12
+    d : int, optional
+        diatonic cardinality, by default None (all scales)
+    block_size : int, optional
+        number of scales per block, by default 65536
+
+    Returns
+    -------
+    tuple
+        the `concepts.Context` and a dict of the number of scales per object
+    """
+    from concepts import Context
+
+    bools, counts, representatives = signatures(c, d, block_size)
+    objects = [
+        " ".join(str(p) for p in range(c) if (int(mask) >> p) & 1) or "{}"
+        for mask in representatives
+    ]
+    context = Context(objects, PROPERTIES, bools.tolist())
+    return context, dict(zip(objects, counts.tolist()))
@@ -0,0 +1,167 @@
+"""
+Bulk generation of tone-cloud MIDI stimuli for all scales of a universe.
+
+Scales are streamed from ``Scales(c, d)`` and rendered in chunks by a pool of
+worker processes, with at most a few chunks per worker in flight, so that
+memory stays bounded however many files are written. Each cloud draws from
+``np.random.default_rng([seed, mask])``, where ``mask`` is the bitmask of the
+scale (bit p for pitch class p): the files do not depend on the order in
+which they are generated or on the number of workers.
+
+Run with ``python -m mscales.generate --help``.
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from . import midi
+from .scales import Scales, _unpack
+from .sound import cloud_notes
+from .utils import map_chunks, reverse_mask, to_masks
+
+
+def scale_rng(mask: int, seed: int = 0) -> np.random.Generator:
+    """The random number generator of the scale with bitmask `mask`."""
+    return np.random.default_rng([seed, int(mask)])
+
+
+def filename(scale, program: int = 0, note_duration: float = 0.15) -> str:
+    """File name of a tone cloud, after instrument, scale and note duration."""
+    binary = "".join(str(int(x > 0)) for x in scale)
+    return f"mid_i{program}_p{binary}_d{int(note_duration * 1000)}.mid"
+
+
+def render_chunk(
+    masks,
+    c: int,
+    out_dir: str,
+    n_notes: int = 100,
+    note_duration: float = 0.15,
+    velocity: int = 100,
+    program: int = 0,
+    seed: int = 0,
+    tuning: str = "bend",
+):
+    """
+    Writes the tone clouds of the scales with bitmasks `masks` to `out_dir`.
+
+    Returns
+    -------
+    tuple
+        number of files and of bytes written
+    """
+    n_bytes = 0
+    masks = np.asarray(masks, dtype=np.uint64)
+    scales = _unpack(reverse_mask(masks, c), c)
+    for mask, scale in zip(masks, scales):
+        notes = cloud_notes(
+            scale, n_notes, note_duration, velocity, scale_rng(mask, seed)
+        )
+        data = midi.encode(notes, program, tuning=tuning)
+        with open(
+            os.path.join(out_dir, filename(scale, program, note_duration)), "wb"
+        ) as f:
+            f.write(data)
+        n_bytes += data.nbytes
+    return len(masks), n_bytes
+
+
+def _chunks(c: int, d: int = None, chunk_size: int = 64):
+    """Bitmasks of the (non-empty) scales of (c, d), in chunks of `chunk_size`."""
+    for scales in Scales(c, d).iter_all(block_size=16 * chunk_size):
+        masks = to_masks(scales)
+        masks = masks[masks > 0]
+        for start in range(0, masks.shape[0], chunk_size):
+            yield masks[start : start + chunk_size]
+
+
+def generate(
+    c: int,
+    d: int = None,
+    out_dir: str = ".",
+    workers: int = None,
+    chunk_size: int = 64,
+    **kwargs,
+):
+    """
+    Writes a tone cloud for every (non-empty) scale of the universe (c, d),
+    see `render_chunk` for the keyword arguments.
+
+    Parameters
+    ----------
+    c : int
+        chromatic cardinality
+    d : int, optional
+        diatonic cardinality, by default None (all scales)
+    out_dir : str, optional
+        directory of the files, by default "."
+    workers : int, optional
+        number of processes, by default ``os.cpu_count()``; 1 renders in the
+        calling process
+    chunk_size : int, optional
+        number of scales per task, by default 64
+
+    Returns
+    -------
+    dict
+        number of files and bytes written and the elapsed time in seconds
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    chunks = _chunks(c, d, chunk_size)
+
+    start = time.perf_counter()
+    n_files = n_bytes = 0
+    for files, size in map_chunks(render_chunk, chunks, workers, c, out_dir, **kwargs):
+        n_files += files
+        n_bytes += size
+
+    return {"files": n_files, "bytes": n_bytes, "seconds": time.perf_counter() - start}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m mscales.generate", description=__doc__.splitlines()[1]
+    )
+    parser.add_argument("c", type=int, help="chromatic cardinality")
+    parser.add_argument("-d", type=int, default=None, help="diatonic cardinality")
+    parser.add_argument("-o", "--out-dir", default=".", help="output directory")
+    parser.add_argument("--n-notes", type=int, default=100)
+    parser.add_argument("--note-duration", type=float, default=0.15)
+    parser.add_argument("--velocity", type=int, default=100)
+    parser.add_argument("--instrument", default="Acoustic Grand Piano")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--tuning", choices=["bend", "mts"], default="bend", help="tuning if c != 12"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    stats = generate(
+        args.c,
+        args.d,
+        args.out_dir,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        n_notes=args.n_notes,
+        note_duration=args.note_duration,
+        velocity=args.velocity,
+        program=midi.program(args.instrument),
+        seed=args.seed,
+        tuning=args.tuning,
+    )
+
+    seconds = max(stats["seconds"], 1e-9)
+    print(
+        f"{stats['files']} files, {stats['bytes'] / 1e6:.1f} MB in {seconds:.2f}s:"
+        f" {stats['files'] / seconds:.0f} files/s,"
+        f" {stats['files'] * args.n_notes / seconds:.0f} notes/s"
+    )
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+import numpy as np
+from typing import NamedTuple
+
+from . import tuning as _tuning
+
+# General MIDI program names, as in pretty_midi.constants.INSTRUMENT_MAP
+GM_INSTRUMENTS = (
+    "Acoustic Grand Piano", "Bright Acoustic Piano", "Electric Grand Piano",
+    "Honky-tonk Piano", "Electric Piano 1", "Electric Piano 2", "Harpsichord",
+    "Clavinet", "Celesta", "Glockenspiel", "Music Box", "Vibraphone", "Marimba",
+    "Xylophone", "Tubular Bells", "Dulcimer", "Drawbar Organ",
+    "Percussive Organ", "Rock Organ", "Church Organ", "Reed Organ", "Accordion",
+    "Harmonica", "Tango Accordion", "Acoustic Guitar (nylon)",
+    "Acoustic Guitar (steel)", "Electric Guitar (jazz)",
+    "Electric Guitar (clean)", "Electric Guitar (muted)", "Overdriven Guitar",
+    "Distortion Guitar", "Guitar Harmonics", "Acoustic Bass",
+    "Electric Bass (finger)", "Electric Bass (pick)", "Fretless Bass",
+    "Slap Bass 1", "Slap Bass 2", "Synth Bass 1", "Synth Bass 2", "Violin",
+    "Viola", "Cello", "Contrabass", "Tremolo Strings", "Pizzicato Strings",
+    "Orchestral Harp", "Timpani", "String Ensemble 1", "String Ensemble 2",
+    "Synth Strings 1", "Synth Strings 2", "Choir Aahs", "Voice Oohs",
+    "Synth Choir", "Orchestra Hit", "Trumpet", "Trombone", "Tuba",
+    "Muted Trumpet", "French Horn", "Brass Section", "Synth Brass 1",
+    "Synth Brass 2", "Soprano Sax", "Alto Sax", "Tenor Sax", "Baritone Sax",
+    "Oboe", "English Horn", "Bassoon", "Clarinet", "Piccolo", "Flute",
+    "Recorder", "Pan Flute", "Blown bottle", "Shakuhachi", "Whistle", "Ocarina",
+    "Lead 1 (square)", "Lead 2 (sawtooth)", "Lead 3 (calliope)", "Lead 4 chiff",
+    "Lead 5 (charang)", "Lead 6 (voice)", "Lead 7 (fifths)",
+    "Lead 8 (bass + lead)", "Pad 1 (new age)", "Pad 2 (warm)",
+    "Pad 3 (polysynth)", "Pad 4 (choir)", "Pad 5 (bowed)", "Pad 6 (metallic)",
+    "Pad 7 (halo)", "Pad 8 (sweep)", "FX 1 (rain)", "FX 2 (soundtrack)",
+    "FX 3 (crystal)", "FX 4 (atmosphere)", "FX 5 (brightness)",
+    "FX 6 (goblins)", "FX 7 (echoes)", "FX 8 (sci-fi)", "Sitar", "Banjo",
+    "Shamisen", "Koto", "Kalimba", "Bagpipe", "Fiddle", "Shanai", "Tinkle Bell",
+    "Agogo", "Steel Drums", "Woodblock", "Taiko Drum", "Melodic Tom",
+    "Synth Drum", "Reverse Cymbal", "Guitar Fret Noise", "Breath Noise",
+    "Seashore", "Bird Tweet", "Telephone Ring", "Helicopter", "Applause",
+    "Gunshot",
+)  # fmt: skip
+
+# pretty_midi's defaults for new files
+RESOLUTION = 220
+TEMPO = 120.0
+
+
+class Notes(NamedTuple):
+    """
+    Notes as parallel arrays: pitches, onsets and offsets (in seconds) and
+    velocities, in the equal division of the octave into `c` steps.
+
+    Pitches count steps of c-EDO above C-1, i.e. pitch class p in octave o
+    is p + c * o; for c = 12 these are MIDI note numbers, otherwise they are
+    tuned by `mscales.tuning`.
+    """
+
+    pitches: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+    velocities: np.ndarray
+    c: int = 12
+
+    def __len__(self):
+        return self.pitches.shape[0]
+
+
+def program(instrument_name: str) -> int:
+    """General MIDI program number of an instrument name."""
+    assert (
+        instrument_name in GM_INSTRUMENTS
+    ), f"Instrument must be in {list(GM_INSTRUMENTS)}"
+    return GM_INSTRUMENTS.index(instrument_name)
+
+
+def to_ticks(times, resolution: int = RESOLUTION, tempo: float = TEMPO):
+    """Times in seconds to (rounded) MIDI ticks at a constant `tempo` (BPM)."""
+    tick_scale = 60.0 / (tempo * resolution)
+    return np.rint(np.asarray(times) / tick_scale).astype(np.int64)
+
+
+def note_events(
+    notes: Notes, resolution: int = RESOLUTION, tempo: float = TEMPO, keys=None
+):
+    """
+    Note-on events (velocity 0 for note offs) of `notes`, in the order in
+    which pretty_midi writes them: by tick, then pitch, then velocity.
+
+    `keys` are the MIDI note numbers of the notes, by default the nearest
+    notes of their pitches (see `mscales.tuning.to_midi`).
+
+    Returns
+    -------
+    tuple
+        ticks, pitches and velocities of the events
+    """
+    n = len(notes)
+    ticks = np.empty(2 * n, dtype=np.int64)
+    pitches = np.empty(2 * n, dtype=np.int64)
+    velocities = np.zeros(2 * n, dtype=np.int64)
+
+    ticks[0::2] = to_ticks(notes.starts, resolution, tempo)
+    ticks[1::2] = to_ticks(notes.ends, resolution, tempo)
+    if keys is None:
+        keys = _tuning.to_midi(notes.pitches, notes.c)[0]
+    pitches[0::2] = pitches[1::2] = keys
+    velocities[0::2] = notes.velocities
+
+    order = np.lexsort((pitches * 256 + velocities, ticks))
+    return ticks[order], pitches[order], velocities[order]
+
+
+class Events(NamedTuple):
+    """
+    Channel messages of one track as parallel arrays: absolute ticks, status
+    bytes, first and second data byte, and the number of data bytes (1 or 2).
+    """
+
+    ticks: np.ndarray
+    status: np.ndarray
+    data1: np.ndarray
+    data2: np.ndarray
+    n_data: np.ndarray
+
+
+def channel_events(
+    notes: Notes,
+    program: int = 0,
+    channel: int = 0,
+    resolution: int = RESOLUTION,
+    tempo: float = TEMPO,
+    keys=None,
+    bends=None,
+) -> Events:
+    """
+    A program change at tick 0 followed by the pitch-bend and note events of
+    `notes`; at equal ticks, pitch-bends come before notes, as in pretty_midi.
+
+    `keys` are the MIDI notes of `notes` (see `note_events`) and `bends` the
+    times (in seconds) and 14-bit values of pitch-bend messages, by default
+    none.
+    """
+    ticks, pitches, velocities = note_events(notes, resolution, tempo, keys)
+    n = ticks.shape[0]
+    times, values = bends if bends is not None else ([], [])
+    values = np.asarray(values, dtype=np.int64)
+    m = values.shape[0]
+
+    events = Events(
+        np.concatenate([[0], to_ticks(times, resolution, tempo), ticks]),
+        np.concatenate(
+            [[0xC0 | channel], np.full(m, 0xE0 | channel), np.full(n, 0x90 | channel)]
+        ),
+        np.concatenate([[program], values & 0x7F, pitches]),
+        np.concatenate([[0], values >> 7, velocities]),
+        np.concatenate([[1], np.full(m + n, 2)]),
+    )
+    if m == 0:
+        return events
+    kinds = np.repeat([0, 1, 2], [1, m, n])
+    order = np.lexsort((kinds, events.ticks))
+    return Events(*(column[order] for column in events))
+
+
+def _voices(tracks, programs, tuning: str = "bend"):
+    """
+    Splits `tracks` into voices of one channel each.
+
+    With pitch-bend tuning, the channels are shared out among the tracks in
+    order, each track getting as many as its bends need but at most an
+    equal share of those left (and at least one). Voices share channels
+    only if their pitch-bends are identical. With MTS tuning, every
+    track is one voice and the keys of all tracks are retuned together.
+
+    Returns
+    -------
+    tuple
+        the voices, as tuples of notes, MIDI keys, pitch-bends (see
+        `channel_events`) and program, and the MTS System Exclusive events
+    """
+    assert tuning in ("bend", "mts"), f"Unknown tuning {tuning}."
+    tracks = [Notes(*map(np.asarray, notes[:4]), notes.c) for notes in tracks]
+
+    if tuning == "mts":
+        tunings = [_tuning.semitones(notes.pitches, notes.c) for notes in tracks]
+        distinct, keys, index = _tuning.mts_keys(np.concatenate([[]] + tunings))
+        ends = np.cumsum([len(notes) for notes in tracks])
+        voices = [
+            (notes, keys[i], None, program)
+            for notes, i, program in zip(tracks, np.split(index, ends[:-1]), programs)
+        ]
+        return voices, _tuning.mts_sysex(keys, distinct)
+
+    voices = []
+    free = 15
+    for i, (notes, program) in enumerate(zip(tracks, programs)):
+        keys, bends, _ = _tuning.to_midi(notes.pitches, notes.c)
+        n_channels = max(1, free // (len(tracks) - i))
+        channels, times, retuned, values = _tuning.allocate(
+            notes.starts, notes.ends, bends, n_channels
+        )
+        n_used = 1 + max([0, *channels.tolist(), *retuned.tolist()])
+        for k in range(n_used):
+            mine, on = channels == k, retuned == k
+            voice = Notes(*(x[mine] for x in notes[:4]), notes.c)
+            voices.append((voice, keys[mine], (times[on], values[on]), program))
+        free -= n_used
+
+    # voices beyond the 15 channels wrap around (see `_channels`), which is
+    # only harmless if the voices sharing a channel have the same bends
+    for k in range(15, len(voices)):
+        (times, values), (first, bends) = voices[k][2], voices[k % 15][2]
+        if not (np.array_equal(times, first) and np.array_equal(values, bends)):
+            raise ValueError(
+                f"{len(voices)} voices with different pitch-bends do not fit "
+                "into the 15 MIDI channels; use fewer tracks or tuning='mts'."
+            )
+    return voices, b""
+
+
+def _merge(events) -> Events:
+    """Events of several tracks in one, ordered by tick and then by track."""
+    merged = Events(*(np.concatenate(columns) for columns in zip(*events)))
+    order = np.argsort(merged.ticks, kind="stable")
+    return Events(*(column[order] for column in merged))
+
+
+def _vlq(values: np.ndarray):
+    """Lengths (1 to 4) and bytes of variable-length quantities, padded to 4."""
+    values = np.asarray(values, dtype=np.int64)
+    assert (values < 1 << 28).all(), "Delta times must be below 2**28 ticks."
+
+    lengths = 1 + sum((values >= 1 << (7 * k)).astype(np.int64) for k in (1, 2, 3))
+    k = np.arange(4)
+    shift = 7 * np.maximum(lengths[:, None] - 1 - k, 0)
+    more = np.where(k < lengths[:, None] - 1, 0x80, 0)
+    return lengths, (((values[:, None] >> shift) & 0x7F) | more).astype(np.uint8)
+
+
+def _timing_meta(resolution: int = RESOLUTION, tempo: float = TEMPO) -> bytes:
+    """Tempo and 4/4 time signature at tick 0, as pretty_midi writes them."""
+    tick_scale = 60.0 / (tempo * resolution)
+    microseconds = int(6e7 / (60.0 / (tick_scale * resolution)))
+    return (
+        b"\x00\xff\x51\x03"
+        + microseconds.to_bytes(3, "big")
+        + b"\x00\xff\x58\x04\x04\x02\x18\x08"
+    )
+
+
+def encode_track(events: Events, meta: bytes = b"", end: int = None) -> np.ndarray:
+    """
+    MTrk chunk of `events`, preceded by the meta events `meta` at tick 0.
+
+    Status bytes are omitted while they repeat (running status), and the
+    end of track is placed at tick `end`, by default one tick after the last
+    event.
+
+    Returns
+    -------
+    np.ndarray
+        the bytes of the chunk (dtype uint8)
+    """
+    return encode_tracks([events], meta, [end])
+
+
+def encode_tracks(tracks, meta: bytes = b"", ends=None) -> np.ndarray:
+    """
+    MTrk chunks of several tracks of `Events`, one after the other, the first
+    preceded by the meta events `meta` (see `encode_track`). All chunks are
+    assembled at once, so that many short tracks cost little more than one.
+
+    `ends` are the ticks of the ends of track, by default one tick after the
+    last event of each.
+    """
+    counts = np.array([len(events.ticks) for events in tracks], dtype=np.int64)
+    ticks, status, data1, data2, n_data = (
+        np.concatenate([np.asarray(c, dtype=np.int64) for c in column])
+        for column in zip(*tracks)
+    )
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    first = np.zeros(ticks.shape[0], dtype=bool)
+    first[bounds[:-1][counts > 0]] = True
+
+    delta = np.diff(ticks, prepend=0)
+    delta[first] = ticks[first]
+    lengths, vlq = _vlq(delta)
+    emit = np.ones(status.shape[0], dtype=np.int64)
+    emit[1:] = status[1:] != status[:-1]
+    emit[first] = 1
+
+    last = np.zeros(len(tracks), dtype=np.int64)
+    last[counts > 0] = ticks[bounds[1:][counts > 0] - 1]
+    if ends is None:
+        ends = [None] * len(tracks)
+    ends = [t + 1 if end is None else end for t, end in zip(last, ends)]
+    end_lengths, end_vlq = _vlq(np.asarray(ends) - last)
+
+    sizes = lengths + emit + n_data
+    cumulative = np.concatenate([[0], np.cumsum(sizes)])
+    metas = np.zeros(len(tracks), dtype=np.int64)
+    metas[0] = len(meta)
+    chunk_sizes = metas + np.diff(cumulative[bounds]) + end_lengths + 3
+    chunk_starts = np.cumsum(8 + chunk_sizes) - 8 - chunk_sizes
+
+    out = np.empty(int((8 + chunk_sizes).sum()), dtype=np.uint8)
+    out[8 : 8 + len(meta)] = np.frombuffer(meta, dtype=np.uint8)
+    for t, (start, size) in enumerate(zip(chunk_starts, chunk_sizes)):
+        header = b"MTrk" + int(size).to_bytes(4, "big")
+        out[start : start + 8] = np.frombuffer(header, dtype=np.uint8)
+        stop = start + 8 + size
+        out[stop - end_lengths[t] - 3 : stop - 3] = end_vlq[t, : end_lengths[t]]
+        out[stop - 3 : stop] = (0xFF, 0x2F, 0x00)
+
+    # events start after the chunk header and meta events of their track
+    offsets = cumulative[:-1] + np.repeat(
+        chunk_starts + 8 + metas - cumulative[bounds[:-1]], counts
+    )
+    for k in range(4):
+        rows = lengths > k
+        out[offsets[rows] + k] = vlq[rows, k]
+    offsets = offsets + lengths
+    out[offsets[emit > 0]] = status[emit > 0]
+    offsets = offsets + emit
+    out[offsets] = data1
+    out[offsets[n_data > 1] + 1] = data2[n_data > 1]
+    return out
+
+
+def _channels(n_tracks: int):
+    """MIDI channels of the tracks, skipping the drum channel 9 as pretty_midi."""
+    channels = [channel for channel in range(16) if channel != 9]
+    return [channels[n % len(channels)] for n in range(n_tracks)]
+
+
+def encode(
+    tracks,
+    programs=0,
+    format: int = 1,
+    resolution: int = RESOLUTION,
+    tempo: float = TEMPO,
+    tuning: str = "bend",
+) -> memoryview:
+    """
+    Encodes notes as a Standard MIDI File.
+
+    In format 1 (as written by pretty_midi) the tempo and time signature are
+    in a first track, followed by one track per channel; in format 0 all
+    events are merged into a single track, as ``mido.merge_tracks`` would.
+    Each instrument gets its own channels (skipping the drum channel 9). The
+    file is assembled in one buffer, which is returned without copying.
+
+    Notes of 12-EDO are played on one channel per instrument. Other
+    divisions of the octave are tuned by pitch-bend, on as many channels
+    per instrument as needed, or by MIDI Tuning Standard messages at the
+    start of the file (see `mscales.tuning`).
+
+    Parameters
+    ----------
+    tracks : Notes or sequence of Notes
+        the notes of one or several instruments
+    programs : int or sequence of int, optional
+        General MIDI programs of the instruments, by default 0
+    format : int, optional
+        SMF format, 0 or 1, by default 1
+    resolution : int, optional
+        ticks per quarter note, by default 220
+    tempo : float, optional
+        beats per minute, by default 120
+    tuning : str, optional
+        "bend" or "mts", by default "bend"
+
+    Returns
+    -------
+    memoryview
+        the bytes of the file
+    """
+    assert format in (0, 1), f"Unsupported SMF format {format}."
+
+    if isinstance(tracks, Notes):
+        tracks = [tracks]
+    programs = np.broadcast_to(programs, (len(tracks),))
+    voices, sysex = _voices(tracks, programs, tuning)
+    events = [
+        channel_events(notes, program, channel, resolution, tempo, keys, bends)
+        for (notes, keys, bends, program), channel in zip(
+            voices, _channels(len(voices))
+        )
+    ]
+
+    meta = _timing_meta(resolution, tempo) + sysex
+    if format == 1:
+        n_tracks = 1 + len(events)
+        chunks = encode_tracks([Events(*[[]] * 5)] + events, meta)
+    else:
+        ends = [1] + [e.ticks[-1] + 1 for e in events]
+        n_tracks = 1
+        chunks = encode_track(_merge(events), meta, end=max(ends))
+
+    header = b"MThd\x00\x00\x00\x06" + b"".join(
+        n.to_bytes(2, "big") for n in (format, n_tracks, resolution)
+    )
+    data = np.concatenate([np.frombuffer(header, dtype=np.uint8), chunks])
+    return memoryview(data)
+
+
+def write(
+    file,
+    tracks,
+    programs=0,
+    format: int = 1,
+    resolution: int = RESOLUTION,
+    tempo: float = TEMPO,
+    tuning: str = "bend",
+):
+    """
+    Writes notes to a Standard MIDI File, see `encode` for the parameters.
+
+    `file` is a path or a file object.
+    """
+    data = encode(tracks, programs, format, resolution, tempo, tuning)
+
+    if hasattr(file, "write"):
+        file.write(data)
+    else:
+        with open(file, "wb") as f:
+            f.write(data)
+
+
+def to_pretty_midi(
+    tracks, programs=0, resolution: int = RESOLUTION, tempo: float = TEMPO
+):
+    """
+    A `pretty_midi.PrettyMIDI` object with one instrument per channel of
+    `tracks`, tuned by pitch-bend as in `encode`.
+    """
+    import pretty_midi as pm
+
+    if isinstance(tracks, Notes):
+        tracks = [tracks]
+    programs = np.broadcast_to(programs, (len(tracks),))
+
+    midi = pm.PrettyMIDI(resolution=resolution, initial_tempo=tempo)
+    for notes, keys, (times, values), program in _voices(tracks, programs)[0]:
+        instrument = pm.Instrument(program=int(program))
+        instrument.notes = [
+            pm.Note(velocity=v, pitch=p, start=s, end=e)
+            for p, s, e, v in zip(
+                keys.tolist(),
+                notes.starts.tolist(),
+                notes.ends.tolist(),
+                notes.velocities.tolist(),
+            )
+        ]
+        instrument.pitch_bends = [
+            pm.PitchBend(pitch=v - _tuning.CENTER, time=t)
+            for t, v in zip(times.tolist(), values.tolist())
+        ]
+        midi.instruments.append(instrument)
+    return midi
@@ -1,8 +1,120 @@
-import matplotlib.pyplot as plt
+"""
+Plots of scales.
+
+`ScaleFigure` draws the axes of a kind of plot once and then only updates the
+data of its artists (bar heights, stems, polygon vertices) for each scale.
+Figures of batch rendering (`save_all`) are created without pyplot, on the
+non-interactive Agg canvas, and are reused for every scale of a process, so
+that memory stays flat over arbitrarily many files.
+"""
+
+import os
+import time
+from functools import lru_cache
+
 import numpy as np
 
+from .utils import map_chunks
+
+KINDS = ("barcode", "polar", "area")
+
 
-def plot_barcode(s, save=False):
+class ScaleFigure:
+    """
+    A figure of scales of `c` pitch classes, updated in place.
+
+    Parameters
+    ----------
+    c : int
+        chromatic cardinality
+    kind : str, optional
+        "barcode" (bar plot), "polar" (stems on a circle) or "area" (polygon
+        on a circle), by default "barcode"
+    figure : matplotlib.figure.Figure, optional
+        figure to draw on, by default a new figure on the Agg canvas, which
+        pyplot does not keep track of
+    figsize : tuple, optional
+        size of a new figure in inches, by default (6.4, 4.8)
+    dpi : int, optional
+        resolution of a new figure, by default 100
+    """
+
+    def __init__(self, c: int, kind="barcode", figure=None, figsize=None, dpi=100):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown plot kind {kind!r}, valid kinds are {KINDS}.")
+
+        if figure is None:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+
+            figure = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(figure)
+
+        self.c = c
+        self.kind = kind
+        self.figure = figure
+
+        if kind == "barcode":
+            self.ax = figure.subplots()
+            self._bars = self.ax.bar(np.arange(c), np.zeros(c), color="k")
+            self.ax.set(xlabel="Pitch class", yticks=[], ylim=(0, 1))
+            return
+
+        self.ax = figure.subplots(subplot_kw={"projection": "polar", "clip_on": False})
+        self.ax.set_theta_direction(-1)
+        self.ax.set_theta_zero_location("N")
+        self.ax.set_yticklabels([])
+        self.ax.set_ylim(0, 1)
+        self.ax.set_thetagrids(np.linspace(0, 360, c, endpoint=False), np.arange(c))
+
+        if kind == "polar":
+            self._stems = self.ax.stem([0], [1], linefmt="k", markerfmt="ok")
+            for artist in self._stems:
+                artist.set_clip_on(False)
+                artist.set_linewidth(3)
+            self._stems.markerline.set_markersize(10)
+        else:
+            (self._line,) = self.ax.plot([0], [1], c="k", zorder=5)
+            (self._area,) = self.ax.fill([0], [1], alpha=0.75, zorder=4)
+
+    def update(self, s: np.ndarray):
+        """
+        Shows the scale `s` (a binary vector of length c).
+
+        Returns
+        -------
+        ScaleFigure
+            the figure itself
+        """
+        s = np.asarray(s)
+        assert s.shape == (self.c,), f"Expected a scale of {self.c} pitch classes."
+
+        if self.kind == "barcode":
+            for bar, height in zip(self._bars, s.tolist()):
+                bar.set_height(height)
+            return self
+
+        thetas = np.flatnonzero(s) / self.c * 2 * np.pi
+        radii = np.ones(thetas.shape[0])
+
+        if self.kind == "polar":
+            markerline, stemlines, baseline = self._stems
+            markerline.set_data(thetas, radii)
+            stemlines.set_segments([[(t, 0), (t, 1)] for t in thetas])
+            baseline.set_data(thetas, np.zeros(thetas.shape[0]))
+        else:
+            closed = np.concatenate([thetas, thetas[:1]])
+            self._line.set_data(closed, np.ones(closed.shape[0]))
+            vertices = np.column_stack([closed, np.ones(closed.shape[0])])
+            self._area.set_xy(vertices if vertices.shape[0] else np.zeros((1, 2)))
+        return self
+
+    def save(self, file, **kwargs):
+        """Saves the figure, see `matplotlib.figure.Figure.savefig`."""
+        self.figure.savefig(file, **kwargs)
+
+
+def plot_barcode(s, save=False, show=True):
     """
     Bar plot of a scale.
 
@@ -10,38 +122,298 @@ def plot_barcode(s, save=False):
     ----------
     s : np.array
         Numpy array of ones and zeroes.
+    save : str, optional
+        path of a file to save the figure to, by default False
+    show : bool, optional
+        whether to show the figure with ``plt.show()``, by default True
+
+    Returns
+    -------
+    matplotlib.axes.Axes
+        the axes of the plot
     """
+    import matplotlib.pyplot as plt
 
-    _, ax = plt.subplots()
-    ax.bar(np.arange(s.shape[0]), s, color="k")
-    ax.set(xlabel="Pitch class", yticks=[], ylim=(0, 1))
+    figure = ScaleFigure(s.shape[0], "barcode", plt.figure()).update(s)
 
     if save:
-        plt.savefig(save)
-    plt.show()
+        figure.save(save)
+    if show:
+        plt.show()
+    return figure.ax
+
+
+def plot_polar(s, save=False, show=True):
+    """
+    Polar plot of a scale, see `plot_barcode` for the parameters.
+    """
+    import matplotlib.pyplot as plt
+
+    figure = ScaleFigure(s.shape[0], "polar", plt.figure()).update(s)
+
+    if save:
+        figure.save(save)
+    if show:
+        plt.show()
+    return figure.ax
+
+
+def _circles(centers: np.ndarray, radius: float, n_points: int = 64) -> np.ndarray:
+    """Closed polygons of circles around `centers`, shape (n, n_points + 1, 2)."""
+    angles = np.linspace(0, 2 * np.pi, n_points + 1)
+    ring = radius * np.stack([np.sin(angles), np.cos(angles)], axis=1)
+    return centers[:, None, :] + ring
+
+
+def atlas_collections(scales, kind: str = "polar", ncols: int = None):
+    """
+    Collections that draw `scales` as glyphs on a grid of unit cells.
 
+    The glyph of row k of `scales` is in the cell of row ``k // ncols`` and
+    column ``k % ncols``, rows going down from y = 0. All glyphs are in a
+    few collections, whatever their number.
 
-def plot_polar(s, save=False):
-    c = s.shape[0]
+    Parameters
+    ----------
+    scales : np.ndarray
+        scales as rows of binary vectors
+    kind : str, optional
+        "barcode", "polar" or "area" (see `ScaleFigure`), by default "polar"
+    ncols : int, optional
+        number of columns, by default the ceiling of the square root of the
+        number of scales
+
+    Returns
+    -------
+    tuple
+        the collections and the numbers of rows and columns of the grid
+    """
+    from matplotlib.collections import LineCollection, PolyCollection
+
+    if kind not in KINDS:
+        raise ValueError(f"Unknown plot kind {kind!r}, valid kinds are {KINDS}.")
+
+    scales = np.asarray(scales) > 0
+    n, c = scales.shape
+    ncols = ncols or max(1, int(np.ceil(np.sqrt(n))))
+    nrows = -(-n // ncols)
+
+    cells = np.arange(n)
+    corners = np.stack([cells % ncols, -(cells // ncols) - 1], axis=1).astype(float)
+    rows, pcs = np.nonzero(scales)
+
+    if kind == "barcode":
+        # bars of width 0.8 / c and height 0.8, above a baseline per cell
+        width = 0.8 / c
+        origins = corners[rows] + 0.1 + np.stack([pcs * width, 0 * pcs], axis=1)
+        bar = np.array([[0, 0], [width, 0], [width, 0.8], [0, 0.8]])
+        bars = origins[:, None, :] + bar
+        baselines = np.stack([corners + [0.1, 0.1], corners + [0.9, 0.1]], axis=1)
+        return (
+            [
+                PolyCollection(bars, facecolors="k", edgecolors="none"),
+                LineCollection(baselines, colors="0.6", linewidths=0.5),
+            ],
+            nrows,
+            ncols,
+        )
+
+    # polar glyphs: pitch class 0 at the top, going clockwise
+    radius = 0.4
+    centers = corners + 0.5
+    angles = 2 * np.pi * pcs / c
+    tips = centers[rows] + radius * np.stack([np.sin(angles), np.cos(angles)], axis=1)
+    outlines = LineCollection(_circles(centers, radius), colors="0.6", linewidths=0.5)
+
+    if kind == "polar":
+        stems = np.stack([centers[rows], tips], axis=1)
+        return (
+            [
+                outlines,
+                LineCollection(stems, colors="k", linewidths=1),
+                PolyCollection(
+                    _circles(tips, radius / 8, 12), facecolors="k", edgecolors="none"
+                ),
+            ],
+            nrows,
+            ncols,
+        )
 
-    # figure and axis settings
-    _, ax = plt.subplots(subplot_kw={"projection": "polar", "clip_on": False})
-    ax.set_theta_direction(-1)
-    ax.set_theta_zero_location("N")
-    ax.set_yticklabels([])
-    ax.set_ylim(0, 1)
-    plt.thetagrids(np.linspace(0, 360, c, endpoint=False), np.arange(c))
+    # polygons of the same number of vertices, the last repeated where needed
+    sizes = scales.sum(axis=1)
+    width = max(sizes.max(initial=0), 1)
+    index = (np.cumsum(sizes) - sizes)[:, None] + np.minimum(
+        np.arange(width), np.maximum(sizes, 1)[:, None] - 1
+    )
+    vertices = np.repeat(centers[:, None, :], width, axis=1)
+    vertices[sizes > 0] = tips[index[sizes > 0]]
+    return (
+        [
+            outlines,
+            PolyCollection(vertices, facecolors="C0", edgecolors="k", alpha=0.75),
+        ],
+        nrows,
+        ncols,
+    )
 
-    # data
-    thetas = [k / c * 2 * np.pi for k in np.argwhere(s > 0)]
-    radii = np.ones(len(thetas))
 
-    stems = ax.stem(thetas, radii, linefmt="k", markerfmt="ok")
-    for st in stems:
-        st.set_clip_on(False)
-    plt.setp(stems, "linewidth", 3)
-    plt.setp(stems[0], "markersize", 10)
+def plot_atlas(
+    scales,
+    kind: str = "polar",
+    ncols: int = None,
+    labels=None,
+    save=False,
+    show=True,
+    figsize=None,
+):
+    """
+    Plots many scales as small glyphs in one axes, see `atlas_collections`.
+
+    Parameters
+    ----------
+    scales : np.ndarray
+        scales as rows of binary vectors
+    kind : str, optional
+        "barcode", "polar" or "area", by default "polar"
+    ncols : int, optional
+        number of columns, by default about the square root of the number of
+        scales
+    labels : sequence of str, optional
+        a label under each glyph, by default none
+    save : str, optional
+        path of a file to save the figure to, by default False
+    show : bool, optional
+        whether to show the figure with ``plt.show()``, by default True
+    figsize : tuple, optional
+        size of the figure in inches, by default 0.6 inches per cell
+
+    Returns
+    -------
+    matplotlib.axes.Axes
+        the axes of the plot
+    """
+    import matplotlib.pyplot as plt
+
+    collections, nrows, ncols = atlas_collections(scales, kind, ncols)
+
+    figure, ax = plt.subplots(figsize=figsize or (0.6 * ncols, 0.6 * nrows))
+    figure.subplots_adjust(left=0.01, right=0.99, bottom=0.01, top=0.99)
+    for collection in collections:
+        ax.add_collection(collection)
+    ax.set(xlim=(0, ncols), ylim=(-nrows, 0), aspect="equal")
+    ax.set_axis_off()
+
+    if labels is not None:
+        for k, label in enumerate(labels):
+            ax.text(
+                k % ncols + 0.5,
+                -(k // ncols) - 1,
+                label,
+                ha="center",
+                va="bottom",
+                fontsize="xx-small",
+            )
 
     if save:
         plt.savefig(save)
-    plt.show()
+    if show:
+        plt.show()
+    return ax
+
+
+@lru_cache(maxsize=8)
+def _figure(c: int, kind: str, figsize, dpi: int) -> ScaleFigure:
+    """The figure of a process for scales of c, reused across chunks."""
+    return ScaleFigure(c, kind, figsize=figsize, dpi=dpi)
+
+
+def filename(s, kind: str = "barcode", format: str = "png") -> str:
+    """File name of the plot of a scale, after kind and scale."""
+    binary = "".join(str(int(x > 0)) for x in s)
+    return f"{kind}_p{binary}.{format}"
+
+
+def save_chunk(
+    scales,
+    out_dir: str,
+    kind: str = "barcode",
+    format: str = "png",
+    figsize=None,
+    dpi: int = 100,
+):
+    """
+    Saves a plot of every scale (row) of `scales` to `out_dir`.
+
+    Returns
+    -------
+    int
+        number of files written
+    """
+    scales = np.asarray(scales)
+    figure = _figure(scales.shape[1], kind, figsize and tuple(figsize), dpi)
+    for s in scales:
+        figure.update(s).save(
+            os.path.join(out_dir, filename(s, kind, format)), format=format
+        )
+    return scales.shape[0]
+
+
+def _chunks(scales, chunk_size: int):
+    """Rows of a matrix, or of an iterable of matrices, in chunks."""
+    blocks = [scales] if isinstance(scales, np.ndarray) else scales
+    for block in blocks:
+        for start in range(0, block.shape[0], chunk_size):
+            yield block[start : start + chunk_size]
+
+
+def save_all(
+    scales,
+    out_dir: str = ".",
+    kind: str = "barcode",
+    format: str = "png",
+    workers: int = None,
+    chunk_size: int = 64,
+    **kwargs,
+):
+    """
+    Saves a plot of every scale to `out_dir`, in parallel.
+
+    Each process draws one figure and only updates its data from scale to
+    scale, see `ScaleFigure`; `save_chunk` gives the keyword arguments.
+
+    Parameters
+    ----------
+    scales : np.ndarray or iterable of np.ndarray
+        scales as rows of binary vectors, or blocks of them such as
+        ``Scales(c, d).iter_all()``
+    out_dir : str, optional
+        directory of the files, by default "."
+    kind : str, optional
+        kind of plot, see `ScaleFigure`, by default "barcode"
+    format : str, optional
+        file format, e.g. "png" or "svg", by default "png"
+    workers : int, optional
+        number of processes, by default ``os.cpu_count()``; 1 renders in the
+        calling process
+    chunk_size : int, optional
+        number of scales per task, by default 64
+
+    Returns
+    -------
+    dict
+        number of files written and the elapsed time in seconds
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    n_files = sum(
+        map_chunks(
+            save_chunk,
+            _chunks(scales, chunk_size),
+            workers,
+            out_dir,
+            kind,
+            format,
+            **kwargs,
+        )
+    )
+    return {"files": n_files, "seconds": time.perf_counter() - start}
@@ -1,6 +1,121 @@
 import numpy as np
-from itertools import product, combinations
+from math import comb
+from itertools import combinations
 from collections import Counter
+from .utils import interval_class_vectors, reverse_mask, rotate_mask
+
+
+def _unrank(ranks: np.ndarray, c: int, d: int) -> np.ndarray:
+    """
+    Integer bitmasks of the scales with `d` pitch classes at the given ranks.
+
+    Scales are ranked in increasing order of their bitmask, which is the
+    combinatorial number system (colexicographic order) of the positions of
+    their set bits. Bit ``c - 1 - j`` represents column ``j`` of the binary
+    vector, so the ranks follow the row order of ``Scales.all``.
+
+    Parameters
+    ----------
+    ranks : np.ndarray
+        ranks between 0 and ``comb(c, d) - 1``
+    c : int
+        chromatic cardinality, at most 64
+    d : int
+        diatonic cardinality
+
+    Returns
+    -------
+    np.ndarray
+        unsigned 64-bit bitmasks, one per rank
+    """
+    r = np.asarray(ranks, dtype=np.uint64).copy()
+    masks = np.zeros(r.shape, dtype=np.uint64)
+
+    for i in range(d, 0, -1):
+        # largest bit position b with comb(b, i) <= r
+        table = np.array([comb(b, i) for b in range(c)], dtype=np.uint64)
+        b = np.searchsorted(table, r, side="right") - 1
+        r -= table[b]
+        masks |= np.left_shift(np.uint64(1), b.astype(np.uint64))
+
+    return masks
+
+
+def _unpack(masks: np.ndarray, c: int, packed: bool = False) -> np.ndarray:
+    """
+    Expand bitmasks into binary vectors (or bytes, if `packed`) of length `c`.
+    """
+    if packed:
+        n_bytes = -(-c // 8)
+        if c == 0:
+            return np.zeros((masks.shape[0], 0), dtype=np.uint8)
+        left_aligned = (masks << np.uint64(64 - c)).astype(">u8")
+        return left_aligned.view(np.uint8).reshape(-1, 8)[:, :n_bytes].copy()
+
+    shifts = np.arange(c - 1, -1, -1, dtype=np.uint64)
+    return ((masks[:, None] >> shifts) & np.uint64(1)).astype(np.uint8)
+
+
+def _necklace_steps(c: int, d: int):
+    """
+    Step sequences of one scale per transposition class, and their periods.
+
+    The necklaces of `d` steps summing to `c` are generated with the algorithm
+    of Fredricksen, Kessler and Maiorana (as given by Ruskey and Sawada) over
+    the steps ``b = c - d + 1 - step``, pruned to the sequences whose steps can
+    still sum to `c`. The prenecklaces of each length are expanded together,
+    one level at a time. The smallest rotation in `b` is the lexicographically
+    largest rotation of the steps, which starts with the largest step.
+
+    Returns
+    -------
+    tuple
+        (n x d) steps and the smallest period (in steps) of each sequence
+    """
+    top = c - d
+    total = d * top + d - c
+    # prefixes, with a sentinel 0 in column 0, and the FKM period p
+    a = np.zeros((1, d + 1), dtype=np.int8)
+    p = np.ones(1, dtype=np.int64)
+    s = np.zeros(1, dtype=np.int64)
+
+    for t in range(1, d + 1):
+        previous = a[np.arange(a.shape[0]), t - p].astype(np.int64)
+        low = np.maximum(previous, total - s - (d - t) * top)
+        high = np.minimum(top, total - s)
+        counts = np.maximum(high - low + 1, 0)
+
+        parent = np.repeat(np.arange(a.shape[0]), counts)
+        offsets = np.arange(parent.shape[0]) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        b = low[parent] + offsets
+
+        a = a[parent]
+        a[:, t] = b
+        p = np.where(b == previous[parent], p[parent], t)
+        s = s[parent] + b
+
+    necklace = d % p == 0
+    return top + 1 - a[necklace, 1:].astype(np.int64), p[necklace]
+
+
+def _necklaces(c: int, d: int):
+    """
+    Bitmasks of the representatives of the transposition classes of scales
+    with `d` pitch classes, where bit p stands for pitch class p, and the
+    number of scales in each class.
+
+    Each representative has the smallest bitmask of its class: it contains 0
+    and descends from there by the steps of `_necklace_steps`.
+    """
+    if d == 0:
+        return np.zeros(1, dtype=np.uint64), np.ones(1, dtype=np.int64)
+
+    steps, periods = _necklace_steps(c, d)
+    pcs = (c - np.cumsum(steps, axis=1)) % c
+    masks = np.bitwise_or.reduce(np.uint64(1) << pcs.astype(np.uint64), axis=1)
+    return masks, c * periods // d
 
 
 class Scales:
@@ -10,30 +125,188 @@ class Scales:
         self.c = c
         self.d = d
 
-    def all(self):
+    def _count(self) -> int:
+        if self.d is None:
+            return 2**self.c
+        return comb(self.c, self.d) if 0 <= self.d <= self.c else 0
+
+    def _masks(self, start: int = 0, stop: int = None) -> np.ndarray:
+        if self.c > 64:
+            raise ValueError(
+                f"Scales can only be enumerated for c <= 64, got c={self.c}."
+            )
+        stop = self._count() if stop is None else stop
+        ranks = np.arange(start, stop, dtype=np.uint64)
+
+        if self.d is None:
+            return ranks
+        return _unrank(ranks, self.c, self.d)
+
+    def all(self, packed: bool = False):
         """
         Return all scales (binary vectors) for a given chromatic cardinality `c`.
 
+        If the diatonic cardinality `d` is set, only the scales with `d` pitch
+        classes are generated, directly from their bitmasks, so that the other
+        ``2**c`` scales are never built.
+
         Parameters
         ----------
-        c : int, optional
-            chromatic cardinality, by default 12
+        packed : bool, optional
+            return each scale as ``ceil(c / 8)`` bytes, as in
+            ``np.packbits(scales, axis=1)``, by default False
 
         Returns
         -------
         numpy.array
-            Numpy array containing all scales.
+            Numpy array of dtype uint8 containing all scales.
+        """
+
+        scales = _unpack(self._masks(), self.c, packed=packed)
+        self.n_scales = scales.shape[0]
+        return scales
+
+    def iter_all(self, block_size: int = 65536, packed: bool = False):
+        """
+        Iterate over all scales in blocks of (at most) `block_size` rows.
+
+        Only one block is held in memory at a time, so that the universe can be
+        streamed for any `c` and consumed while it is still being enumerated.
+
+        Parameters
+        ----------
+        block_size : int, optional
+            number of scales per block, by default 65536
+        packed : bool, optional
+            yield packed bits instead of binary vectors, by default False
+
+        Yields
+        ------
+        numpy.array
+            Numpy array of dtype uint8 containing the next block of scales.
+        """
+
+        self.n_scales = self._count()
+        for start in range(0, self.n_scales, block_size):
+            stop = min(start + block_size, self.n_scales)
+            yield _unpack(self._masks(start, stop), self.c, packed=packed)
+
+    def _classes(self, inversion: bool):
+        if self.c > 64:
+            raise ValueError(
+                f"Scales can only be enumerated for c <= 64, got c={self.c}."
+            )
+        ds = range(self.c + 1) if self.d is None else [self.d]
+        ds = [d for d in ds if 0 <= d <= self.c]
+        classes = [_necklaces(self.c, d) for d in ds]
+        masks = np.concatenate([m for m, _ in classes] or [np.zeros(0, np.uint64)])
+        counts = np.concatenate([n for _, n in classes] or [np.zeros(0, np.int64)])
+
+        if inversion and masks.shape[0]:
+            inverted = reverse_mask(masks, self.c)
+            inverted = np.min(
+                [rotate_mask(inverted, n, self.c) for n in range(self.c)], axis=0
+            )
+            keep = masks <= inverted
+            masks = masks[keep]
+            counts = counts[keep] * np.where(masks == inverted[keep], 1, 2)
+
+        # in the row order of `all`
+        ranks = reverse_mask(masks, self.c) if self.c else masks
+        order = np.argsort(ranks)
+        return ranks[order], counts[order]
+
+    def necklaces(self, packed: bool = False):
         """
+        Return one scale per transposition class, with the size of each class.
 
-        scales = np.asarray(list(product([0, 1], repeat=self.c)))
+        The representatives (necklaces) are generated directly, without
+        building the other scales, so that statistics over the whole universe
+        can be computed on about ``1 / c`` of the scales and weighted by the
+        multiplicities. Each representative contains pitch class 0 and has the
+        smallest bitmask (bit p for pitch class p) of its class; the rows are in
+        the order of `all`.
 
-        if self.d is not None:
-            condition = np.where(scales.sum(axis=1) == self.d)
-            self.n_scales = scales[condition].shape[0]
-            return scales[condition]
-        else:
-            self.n_scales = scales.shape[0]
-            return scales
+        Parameters
+        ----------
+        packed : bool, optional
+            return each scale as ``ceil(c / 8)`` bytes, by default False
+
+        Returns
+        -------
+        tuple
+            (n_classes x c) matrix of representatives and the number of
+            distinct transpositions of each, which sum to the number of scales
+        """
+
+        ranks, counts = self._classes(inversion=False)
+        return _unpack(ranks, self.c, packed=packed), counts
+
+    def bracelets(self, packed: bool = False):
+        """
+        Return one scale per set class (transposition and inversion), with the
+        size of each class.
+
+        The representatives (bracelets) are the necklaces that are not greater
+        than the necklace of their inversion, i.e. the prime forms after Rahn,
+        as in `setclasses.set_classes`.
+
+        Parameters
+        ----------
+        packed : bool, optional
+            return each scale as ``ceil(c / 8)`` bytes, by default False
+
+        Returns
+        -------
+        tuple
+            (n_classes x c) matrix of prime forms and the number of scales
+            in the set class of each, which sum to the number of scales
+        """
+
+        ranks, counts = self._classes(inversion=True)
+        return _unpack(ranks, self.c, packed=packed), counts
+
+    def iter_pitch_classes(self, block_size: int = 65536):
+        """
+        Iterate over the pitch-class representation of all scales in blocks.
+
+        Yields
+        ------
+        list
+            List of numpy arrays containing the pitch classes of the next block
+        """
+
+        for block in self.iter_all(block_size=block_size):
+            yield [np.flatnonzero(row) for row in block]
+
+    def iter_interval_vectors(self, block_size: int = 65536):
+        """
+        Iterate over the interval vectors of all scales in blocks.
+
+        Yields
+        ------
+        list
+            List of Counters for the next block, representing all intervals mod c.
+        """
+
+        for block in self.iter_pitch_classes(block_size=block_size):
+            yield [
+                Counter([(y - x) % self.c for (x, y) in combinations(pc, r=2)])
+                for pc in block
+            ]
+
+    def iter_interval_class_vectors(self, block_size: int = 65536):
+        """
+        Iterate over the interval-class vectors of all scales in blocks.
+
+        Yields
+        ------
+        numpy.array
+            (block_size x c // 2) matrix of interval-class vectors
+        """
+
+        for block in self.iter_all(block_size=block_size):
+            yield interval_class_vectors(block)
 
     def pitch_classes(self):
         """
@@ -45,7 +318,7 @@ class Scales:
             List of numpy arrays containing pitch classes
         """
 
-        return [np.flatnonzero(row) for row in self.all()]
+        return [pc for block in self.iter_pitch_classes() for pc in block]
 
     def interval_vectors(self):
         """
@@ -54,10 +327,19 @@ class Scales:
         Returns
         -------
         list
-            List of Counters, representing all intervals mod 12.
+            List of Counters, representing all intervals mod c.
         """
 
-        return [Counter([(y - x) % 12 for (x, y) in combinations(pc, r=2)]) for pc in self.pitch_classes()]
+        return [iv for block in self.iter_interval_vectors() for iv in block]
+
+    def interval_class_vectors(self):
+        """
+        Interval-class vectors for all scales.
 
+        Returns
+        -------
+        numpy.array
+            (n_scales x c // 2) matrix, counting the interval classes 1 to c // 2
+        """
 
-# TODO: interval CLASS vectors (only from 0 to 6)
+        return interval_class_vectors(self.all())
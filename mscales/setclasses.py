@@ -0,0 +1,290 @@
+import numpy as np
+from functools import lru_cache
+from .utils import rotate_mask, reverse_mask, to_mask
+
+# largest chromatic cardinality for which a table of all 2**c sets is built
+MAX_TABLE_C = 16
+
+# Prime forms as given by Forte (1973). Complements of n-k are named (12-n)-k.
+# Forte packs 5-20, 6-Z29, 6-31, 7-20 and 8-26 differently from Rahn, but the
+# names are looked up by set class, so both conventions are recognized.
+FORTE_PRIME_FORMS = {
+    "3-1": "012", "3-2": "013", "3-3": "014", "3-4": "015", "3-5": "016",
+    "3-6": "024", "3-7": "025", "3-8": "026", "3-9": "027", "3-10": "036",
+    "3-11": "037", "3-12": "048",
+    "4-1": "0123", "4-2": "0124", "4-3": "0134", "4-4": "0125", "4-5": "0126",
+    "4-6": "0127", "4-7": "0145", "4-8": "0156", "4-9": "0167", "4-10": "0235",
+    "4-11": "0135", "4-12": "0236", "4-13": "0136", "4-14": "0237",
+    "4-Z15": "0146", "4-16": "0157", "4-17": "0347", "4-18": "0147",
+    "4-19": "0148", "4-20": "0158", "4-21": "0246", "4-22": "0247",
+    "4-23": "0257", "4-24": "0248", "4-25": "0268", "4-26": "0358",
+    "4-27": "0258", "4-28": "0369", "4-Z29": "0137",
+    "5-1": "01234", "5-2": "01235", "5-3": "01245", "5-4": "01236",
+    "5-5": "01237", "5-6": "01256", "5-7": "01267", "5-8": "02346",
+    "5-9": "01246", "5-10": "01346", "5-11": "02347", "5-Z12": "01356",
+    "5-13": "01248", "5-14": "01257", "5-15": "01268", "5-16": "01347",
+    "5-Z17": "01348", "5-Z18": "01457", "5-19": "01367", "5-20": "01378",
+    "5-21": "01458", "5-22": "01478", "5-23": "02357", "5-24": "01357",
+    "5-25": "02358", "5-26": "02458", "5-27": "01358", "5-28": "02368",
+    "5-29": "01368", "5-30": "01468", "5-31": "01369", "5-32": "01469",
+    "5-33": "02468", "5-34": "02469", "5-35": "02479", "5-Z36": "01247",
+    "5-Z37": "03458", "5-Z38": "01258",
+    "6-1": "012345", "6-2": "012346", "6-Z3": "012356", "6-Z4": "012456",
+    "6-5": "012367", "6-Z6": "012567", "6-7": "012678", "6-8": "023457",
+    "6-9": "012357", "6-Z10": "013457", "6-Z11": "012457", "6-Z12": "012467",
+    "6-Z13": "013467", "6-14": "013458", "6-15": "012458", "6-16": "014568",
+    "6-Z17": "012478", "6-18": "012578", "6-Z19": "013478", "6-20": "014589",
+    "6-21": "023468", "6-22": "012468", "6-Z23": "023568", "6-Z24": "013468",
+    "6-Z25": "013568", "6-Z26": "013578", "6-27": "013469", "6-Z28": "013569",
+    "6-Z29": "013689", "6-30": "013679", "6-31": "013589", "6-32": "024579",
+    "6-33": "023579", "6-34": "013579", "6-35": "02468T", "6-Z36": "012347",
+    "6-Z37": "012348", "6-Z38": "012378", "6-Z39": "023458", "6-Z40": "012358",
+    "6-Z41": "012368", "6-Z42": "012369", "6-Z43": "012568", "6-Z44": "012569",
+    "6-Z45": "023469", "6-Z46": "012469", "6-Z47": "012479", "6-Z48": "012579",
+    "6-Z49": "013479", "6-Z50": "014679",
+}  # fmt: skip
+
+
+def set_classes(masks: np.ndarray, c: int = 12):
+    """
+    Set-class information for pitch-class sets given as bitmasks.
+
+    Bit p of a mask stands for pitch class p. The prime form (after Rahn) is
+    the smallest bitmask among all transpositions and inversions of a set, and
+    the normal form starts on the pitch class whose rotation of the set has
+    the smallest bitmask (ties are broken by the lowest pitch class).
+
+    Parameters
+    ----------
+    masks : np.ndarray
+        bitmasks of the sets
+    c : int, optional
+        chromatic cardinality (at most 64), by default 12
+
+    Returns
+    -------
+    tuple
+        prime forms (bitmasks), transposition n and inversion flag of the
+        operator that maps the prime form onto each set (T_n or T_nI), and
+        first pitch class of the normal form of each set (-1 if empty)
+    """
+    masks = np.asarray(masks, dtype=np.uint64)
+    inverted = reverse_mask(masks, c)
+
+    # candidate n is T_{-n} of the set (n < c) or T_nI of the set (n >= c)
+    candidates = np.stack(
+        [rotate_mask(masks, c - n, c) for n in range(c)]
+        + [rotate_mask(inverted, n + 1, c) for n in range(c)],
+        axis=-1,
+    )
+    operator = candidates.argmin(axis=-1)
+    prime = np.take_along_axis(candidates, operator[..., None], axis=-1)[..., 0]
+
+    rotations = np.stack(
+        [
+            np.where((masks >> s) & 1, rotate_mask(masks, c - s, c), ~np.uint64(0))
+            for s in range(c)
+        ],
+        axis=-1,
+    )
+    normal_start = np.where(masks > 0, rotations.argmin(axis=-1), -1)
+
+    return prime, operator % c, operator >= c, normal_start
+
+
+def normal_forms(pcs: np.ndarray, c: int = 12, method: str = "rahn") -> np.ndarray:
+    """
+    Normal forms of one set or of a stack of sets of the same cardinality.
+
+    Rahn compares the spans from the first to the last, second-to-last, ...
+    pitch class of each rotation, Forte the spans to the last, second,
+    third, ... pitch class. Remaining ties (symmetric sets) go to the rotation
+    with the lowest first pitch class. The spans of each rotation are folded
+    into one integer key, so that the best rotation of every set is a single
+    argmin: for Rahn (c <= 64) the key is the bitmask of the rotation
+    transposed to 0, for Forte the spans in base c. Where the keys do not fit
+    into 64 bits, rotations are eliminated one span at a time instead.
+
+    Parameters
+    ----------
+    pcs : np.ndarray
+        sorted pitch classes, as a (d,) vector or an (n_sets x d) matrix
+    c : int, optional
+        chromatic cardinality, by default 12
+    method : str, optional
+        "rahn" or "forte", by default "rahn"
+
+    Returns
+    -------
+    np.ndarray
+        the pitch classes in normal order, in the shape of `pcs`
+    """
+    assert method in ("rahn", "forte"), f"Unknown normal-form method {method}."
+
+    pcs = np.asarray(pcs, dtype=int)
+    sets = pcs.reshape(-1, pcs.shape[-1])
+    n, d = sets.shape
+    if d < 2:
+        return pcs
+
+    # rotation[:, k] is the index of the k-th pitch class of every rotation
+    rotation = (np.arange(d)[:, None] + np.arange(d)) % d
+    if method == "rahn":
+        order = list(range(d - 1, 0, -1))
+    else:
+        order = [d - 1] + list(range(1, d - 1))
+
+    if method == "rahn" and c <= 64:
+        masks = np.bitwise_or.reduce(np.uint64(1) << sets.astype(np.uint64), axis=1)
+        keys = rotate_mask(masks[:, None], (c - sets).astype(np.uint64), c)
+    elif c ** len(order) < 2**63:
+        keys = np.zeros((n, d), dtype=np.int64)
+        for k in order:
+            keys = keys * c + (sets[:, rotation[:, k]] - sets) % c
+    else:
+        keys = np.zeros((n, d), dtype=np.int64)
+        for k in order:
+            spans = np.where(keys == 0, (sets[:, rotation[:, k]] - sets) % c, c)
+            keys = np.where(spans == spans.min(axis=1, keepdims=True), 0, 1)
+
+    best = keys.argmin(axis=1)
+
+    return sets[np.arange(n)[:, None], rotation[best]].reshape(pcs.shape)
+
+
+class SetClassTable:
+    """
+    Precomputed set classes of all 2**c pitch-class sets, indexed by bitmask.
+    """
+
+    def __init__(self, c: int = 12, chunk_size: int = 1 << 14):
+        assert c <= MAX_TABLE_C, f"Tables are only built for c <= {MAX_TABLE_C}."
+        self.c = c
+
+        n = 2**c
+        self.prime = np.empty(n, dtype=np.uint64)
+        self.transposition = np.empty(n, dtype=np.int8)
+        self.inverted = np.empty(n, dtype=bool)
+        self.normal_start = np.empty(n, dtype=np.int8)
+
+        for start in range(0, n, chunk_size):
+            chunk = slice(start, min(start + chunk_size, n))
+            masks = np.arange(chunk.start, chunk.stop, dtype=np.uint64)
+            (
+                self.prime[chunk],
+                self.transposition[chunk],
+                self.inverted[chunk],
+                self.normal_start[chunk],
+            ) = set_classes(masks, c)
+
+        self.forte = {}
+        if c == 12:
+            self.forte = _forte_names(self.prime)
+
+    def __len__(self):
+        return self.prime.shape[0]
+
+    def forte_name(self, mask: int):
+        """Forte name of the set class of `mask` (None outside of c = 12)."""
+        return self.forte.get(int(self.prime[mask]))
+
+    def operator(self, mask: int):
+        """(n, inverted) such that T_n (or T_nI) maps the prime form onto `mask`."""
+        return int(self.transposition[mask]), bool(self.inverted[mask])
+
+
+def _forte_names(prime: np.ndarray) -> dict:
+    """Forte names for c = 12, keyed by the (Rahn) prime-form bitmask."""
+
+    def pcs(s):
+        return [10 if p == "T" else 11 if p == "E" else int(p) for p in s]
+
+    full = (1 << 12) - 1
+    names = {0: "0-1", 1: "1-1", full: "12-1", int(prime[full - 1]): "11-1"}
+    for k in range(1, 7):
+        names[int(prime[to_mask([0, k])])] = f"2-{k}"
+        names[int(prime[full ^ to_mask([0, k])])] = f"10-{k}"
+
+    for name, pf in FORTE_PRIME_FORMS.items():
+        mask = to_mask(pcs(pf))
+        names[int(prime[mask])] = name
+
+        d, number = name.split("-")
+        if d != "6":
+            names[int(prime[full ^ mask])] = f"{12 - int(d)}-{number}"
+
+    return names
+
+
+@lru_cache(maxsize=None)
+def set_class_table(c: int = 12) -> SetClassTable:
+    """The set-class table for chromatic cardinality `c`, built on first use."""
+    return SetClassTable(c)
+
+
+def lookup(masks: np.ndarray, c: int = 12, chunk_size: int = 1 << 14):
+    """
+    Set-class information of many bitmasks, as returned by `set_classes`.
+
+    For c <= MAX_TABLE_C the values are looked up in the set-class table of
+    `c`, otherwise they are computed in chunks of `chunk_size` sets.
+    """
+    if c > 64:
+        raise ValueError(f"Bitmasks hold at most 64 pitch classes, got c={c}.")
+    masks = np.asarray(masks, dtype=np.uint64)
+
+    if c <= MAX_TABLE_C:
+        table = set_class_table(c)
+        index = masks.astype(np.intp)
+        return (
+            table.prime[index],
+            table.transposition[index],
+            table.inverted[index],
+            table.normal_start[index],
+        )
+
+    chunks = [
+        set_classes(masks[start : start + chunk_size], c)
+        for start in range(0, masks.shape[0], chunk_size)
+    ] or [set_classes(masks, c)]
+    return tuple(np.concatenate(columns) for columns in zip(*chunks))
+
+
+def set_class(mask: int, c: int = 12):
+    """
+    Set-class information of a single bitmask, as returned by `set_classes`.
+
+    For c <= MAX_TABLE_C this is a lookup in the set-class table of `c`; for
+    c > 64 it is computed on Python integers.
+    """
+    if c > 64:
+        return _set_class(mask, c)
+    if c <= MAX_TABLE_C:
+        table = set_class_table(c)
+        n, inverted = table.operator(mask)
+        return int(table.prime[mask]), n, inverted, int(table.normal_start[mask])
+
+    prime, n, inverted, start = lookup(np.array([mask], dtype=np.uint64), c)
+    return int(prime[0]), int(n[0]), bool(inverted[0]), int(start[0])
+
+
+def _set_class(mask: int, c: int):
+    """`set_class` of a bitmask of any length, as in `set_classes`."""
+    mask = int(mask)
+    inverted = sum(1 << (c - 1 - p) for p in range(c) if (mask >> p) & 1)
+    candidates = [rotate_mask(mask, c - n, c) for n in range(c)] + [
+        rotate_mask(inverted, n + 1, c) for n in range(c)
+    ]
+    prime = min(candidates)
+    operator = candidates.index(prime)
+
+    rotations = [rotate_mask(mask, c - s, c) for s in range(c) if (mask >> s) & 1]
+    starts = [s for s in range(c) if (mask >> s) & 1]
+    start = starts[rotations.index(min(rotations))] if mask else -1
+
+    return prime, operator % c, operator >= c, start
+
+
+def forte_name(mask: int, c: int = 12):
+    """Forte name of the set class of a bitmask (None outside of c = 12)."""
+    return set_class_table(12).forte_name(mask) if c == 12 else None
@@ -1,49 +1,114 @@
 import numpy as np
 from numpy.random import default_rng
-import pretty_midi as pm
-
+from . import midi
+from .midi import Notes
 
 rng = default_rng(123)
 
 
-def tone_cloud(
+def _generator(seed) -> np.random.Generator:
+    """`np.random.default_rng(seed)`, or the module's generator if `seed` is None."""
+    return rng if seed is None else default_rng(seed)
+
+
+def cloud_notes(
     scale,
     n_notes: int = 100,
     note_duration: float = 0.15,
     velocity: int = 100,
-    instrument_name: str = "Acoustic Grand Piano",
-    save_as: str = None,
-):
+    rng=None,
+) -> Notes:
+    """
+    Random pitches of `scale` in octaves 3 to 6, played one after the other.
+
+    Parameters
+    ----------
+    scale : np.ndarray
+        binary vector of the scale
+    n_notes : int, optional
+        number of notes, by default 100
+    note_duration : float, optional
+        duration of each note in seconds, by default 0.15
+    velocity : int, optional
+        MIDI velocity, by default 100
+    rng : np.random.Generator or seed, optional
+        random number generator, or a seed for `np.random.default_rng`, by
+        default the module's generator (whose draws depend on all earlier
+        calls)
+
+    Returns
+    -------
+    Notes
+        the notes of the cloud as arrays
+    """
+    rng = _generator(rng)
     starts = np.arange(n_notes) * note_duration  # onsets
     ends = starts + note_duration  # offsets
 
-    # binary = "".join([str(x) for x in scale])
-
-    pitches = [x for x in rng.choice(np.nonzero(scale)[0], size=n_notes)]
+    pitches = rng.choice(np.nonzero(scale)[0], size=n_notes)
     octaves = rng.choice(np.arange(3, 7), size=n_notes)
-    midi_pitches = [(p + 12 * o) for p, o in list(zip(pitches, octaves))]
 
-    # Create a PrettyMIDI object
-    midi = pm.PrettyMIDI()
+    c = len(scale)
+    return Notes(pitches + c * octaves, starts, ends, np.full(n_notes, velocity), c)
+
 
-    # Create an Instrument instance for an instrument
-    assert instrument_name in pm.constants.INSTRUMENT_MAP, f"Instrument must be in {pm.constants.INSTRUMENT_MAP}"
-    # instrument_code = pm.constants.INSTRUMENT_MAP.index(instrument_name)
+def chord_notes(
+    pcs, note_duration: float = 0.15, velocity: int = 100, c: int = 12
+) -> Notes:
+    """The pitch classes `pcs` of c-EDO in octave 4, sounding together."""
+    pcs = np.asarray(pcs, dtype=int)
+    n_notes = pcs.shape[0]
+    return Notes(
+        pcs + c * 4,
+        np.zeros(n_notes),
+        np.full(n_notes, note_duration),
+        np.full(n_notes, velocity),
+        c,
+    )
 
-    program = pm.instrument_name_to_program(instrument_name)
-    instrument = pm.Instrument(program=program)
 
-    for mp, s, e in zip(midi_pitches, starts, ends):
-        # Create a Note instance for this note, starting at `s` and ending at `e`.
-        note = pm.Note(pitch=mp, velocity=velocity, start=s, end=e)
-        # Add it to instrument
-        instrument.notes.append(note)
+def render(
+    notes: Notes,
+    instrument_name: str,
+    save_as: str = None,
+    pretty=True,
+    tuning: str = "bend",
+):
+    """
+    Writes `notes` to the MIDI file `save_as` or returns them, as a
+    `pretty_midi.PrettyMIDI` object if `pretty` and as `Notes` otherwise.
 
-    # Add the instrument to the PrettyMIDI object
-    midi.instruments.append(instrument)
+    Notes outside 12-EDO are tuned by pitch-bend or, in files only, by MIDI
+    Tuning Standard messages if `tuning` is "mts" (see `midi.encode`).
+    """
+    program = midi.program(instrument_name)
 
     if save_as is not None:
-        # filename = f'mid_i{instrument_code}_p{binary}_d{int(note_duration * 1000)}.mid'
-        midi.write(save_as)
+        midi.write(save_as, notes, program, tuning=tuning)
+    elif pretty:
+        return midi.to_pretty_midi(notes, program)
     else:
-        return midi
+        return notes
+
+
+def tone_cloud(
+    scale,
+    n_notes: int = 100,
+    note_duration: float = 0.15,
+    velocity: int = 100,
+    instrument_name: str = "Acoustic Grand Piano",
+    save_as: str = None,
+    pretty: bool = True,
+    rng=None,
+    tuning: str = "bend",
+):
+    """
+    A tone cloud of random pitches of `scale`, see `cloud_notes`.
+
+    The MIDI file is written straight from the note arrays if `save_as` is
+    given. Otherwise a `pretty_midi.PrettyMIDI` object is returned, or the
+    `Notes` themselves if `pretty` is False. Scales of other cardinalities
+    than 12 are tuned as their equal division of the octave, see `render`.
+    """
+    notes = cloud_notes(scale, n_notes, note_duration, velocity, rng)
+    return render(notes, instrument_name, save_as, pretty, tuning)
@@ -0,0 +1,220 @@
+"""
+Wavetable synthesis of notes, for any equal division of the octave.
+
+Every sample of every note is computed at once with NumPy: the phase of a
+note's sample is a multiple of the note's phase increment, read from one
+single-cycle wavetable (with linear interpolation), shaped by a linear
+attack and release and summed into the output with `np.bincount`. Audio is
+rendered in chunks of `chunk_size` samples, so that memory is bounded by the
+chunk size and the number of overlapping notes, not by the duration. The
+notes are scheduled once, ordered by onset, so that the notes sounding in
+each chunk are found by binary search.
+"""
+
+import os
+import wave
+from typing import NamedTuple
+
+import numpy as np
+
+from .midi import Notes
+
+SAMPLE_RATE = 44100
+
+# frequency of C-1 (MIDI note 0), the lowest pitch of every c-EDO
+C_MINUS_1 = 440.0 * 2 ** (-69 / 12)
+
+
+def wavetable(partials=(1, 1 / 2, 1 / 3, 1 / 4, 1 / 5, 1 / 6), size: int = 2048):
+    """
+    Single cycle of a waveform with the given amplitudes of the harmonic
+    partials, normalized to a peak of 1.
+
+    Returns
+    -------
+    np.ndarray
+        `size` + 1 samples, the last repeating the first for interpolation
+    """
+    phase = 2 * np.pi * np.arange(size + 1) / size
+    table = sum(a * np.sin((k + 1) * phase) for k, a in enumerate(partials))
+    return table / np.abs(table).max()
+
+
+DEFAULT_TABLE = wavetable()
+
+
+def frequencies(pitches, c: int = 12, reference: float = C_MINUS_1) -> np.ndarray:
+    """
+    Frequencies (in Hz) of pitches of c-EDO, counted in steps above
+    `reference`, by default C-1, so that MIDI note 69 is A4 = 440 Hz.
+    """
+    return reference * 2 ** (np.asarray(pitches) / c)
+
+
+class _Schedule(NamedTuple):
+    """
+    Onset and offset samples, phase increments (in table entries per sample)
+    and amplitudes of notes, ordered by onset; `reach` is the latest offset
+    of the notes up to each one and `order` their index among the notes.
+    """
+
+    onsets: np.ndarray
+    offsets: np.ndarray
+    steps: np.ndarray
+    amplitudes: np.ndarray
+    reach: np.ndarray
+    order: np.ndarray
+
+
+def _schedule(notes: Notes, sample_rate, table, gain) -> _Schedule:
+    """The `_Schedule` of `notes`, computed once for all chunks."""
+    onsets = np.rint(np.asarray(notes.starts) * sample_rate).astype(np.int64)
+    order = np.argsort(onsets, kind="stable")
+    offsets = np.rint(np.asarray(notes.ends) * sample_rate).astype(np.int64)[order]
+    steps = frequencies(notes.pitches, notes.c)[order] * (table.shape[0] - 1)
+    amplitudes = gain * np.asarray(notes.velocities)[order] / 127
+    return _Schedule(
+        onsets[order],
+        offsets,
+        steps / sample_rate,
+        amplitudes,
+        np.maximum.accumulate(offsets) if len(offsets) else offsets,
+        order,
+    )
+
+
+def _window(
+    schedule: _Schedule, start: int, stop: int, sample_rate, table, attack, release
+):
+    """The samples `start` to `stop` of the scheduled notes, as float64."""
+    onsets, offsets = schedule.onsets, schedule.offsets
+    # notes starting before `stop`, after the last one ending before `start`
+    first = np.searchsorted(schedule.reach, start, side="right")
+    last = np.searchsorted(onsets, stop, side="left")
+    candidates = np.arange(first, max(first, last))
+    sounding = candidates[
+        (offsets[candidates] > start) & (offsets[candidates] > onsets[candidates])
+    ]
+    # summed in the order of the notes
+    sounding = sounding[np.argsort(schedule.order[sounding])]
+
+    lo = np.maximum(onsets[sounding], start)
+    hi = np.minimum(offsets[sounding], stop)
+    counts = hi - lo
+    if counts.sum() == 0:
+        return np.zeros(stop - start)
+
+    # one entry per sample of every sounding note
+    note = np.repeat(sounding, counts)
+    first = np.cumsum(counts) - counts
+    time = np.repeat(lo, counts) + np.arange(counts.sum()) - np.repeat(first, counts)
+    elapsed = time - onsets[note]
+    remaining = offsets[note] - time
+
+    size = table.shape[0] - 1
+    phase = (elapsed * schedule.steps[note]) % size
+    index = phase.astype(np.int64)
+    samples = table[index] + (phase - index) * (table[index + 1] - table[index])
+
+    envelope = np.minimum(
+        1.0,
+        np.minimum(
+            (elapsed + 1) / max(attack * sample_rate, 1),
+            remaining / max(release * sample_rate, 1),
+        ),
+    )
+
+    return np.bincount(
+        time - start,
+        weights=samples * envelope * schedule.amplitudes[note],
+        minlength=stop - start,
+    )
+
+
+def n_samples(notes: Notes, sample_rate: int = SAMPLE_RATE) -> int:
+    """Number of samples until the end of the last note."""
+    if len(notes) == 0:
+        return 0
+    return int(np.rint(np.max(notes.ends) * sample_rate))
+
+
+def stream(
+    notes: Notes,
+    sample_rate: int = SAMPLE_RATE,
+    chunk_size: int = 1 << 16,
+    table: np.ndarray = DEFAULT_TABLE,
+    gain: float = 0.25,
+    attack: float = 0.005,
+    release: float = 0.02,
+):
+    """
+    Renders `notes` chunk by chunk.
+
+    Parameters
+    ----------
+    notes : Notes
+        the notes, in c-EDO
+    sample_rate : int, optional
+        samples per second, by default 44100
+    chunk_size : int, optional
+        samples per chunk, by default 65536
+    table : np.ndarray, optional
+        wavetable, see `wavetable`, by default six harmonics falling as 1/k
+    gain : float, optional
+        amplitude of a note of velocity 127, by default 0.25
+    attack : float, optional
+        duration of the linear fade-in in seconds, by default 0.005
+    release : float, optional
+        duration of the linear fade-out in seconds, by default 0.02
+
+    Yields
+    ------
+    np.ndarray
+        the next (at most) `chunk_size` samples, as float32
+    """
+    total = n_samples(notes, sample_rate)
+    schedule = _schedule(notes, sample_rate, table, gain)
+    for start in range(0, total, chunk_size):
+        stop = min(start + chunk_size, total)
+        chunk = _window(schedule, start, stop, sample_rate, table, attack, release)
+        yield chunk.astype(np.float32)
+
+
+def render(notes: Notes, sample_rate: int = SAMPLE_RATE, dtype="float32", **kwargs):
+    """
+    Renders `notes` into one PCM buffer, see `stream` for the keyword
+    arguments.
+
+    Returns
+    -------
+    np.ndarray
+        float32 samples in [-1, 1], or int16 samples if `dtype` is "int16"
+    """
+    samples = np.concatenate(
+        [np.zeros(0, dtype=np.float32)] + list(stream(notes, sample_rate, **kwargs))
+    )
+    return to_pcm16(samples) if np.dtype(dtype) == np.int16 else samples
+
+
+def to_pcm16(samples: np.ndarray) -> np.ndarray:
+    """Clips float samples to [-1, 1] and converts them to 16-bit PCM."""
+    return np.rint(np.clip(samples, -1, 1) * 32767).astype(np.int16)
+
+
+def write_wav(file, notes: Notes, sample_rate: int = SAMPLE_RATE, **kwargs):
+    """
+    Writes `notes` as a mono 16-bit WAV file, rendering and writing one chunk
+    at a time (see `stream` for the keyword arguments).
+
+    `file` is a path or a file object.
+    """
+    if isinstance(file, os.PathLike):
+        file = os.fspath(file)
+
+    with wave.open(file, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(sample_rate)
+        out.setnframes(n_samples(notes, sample_rate))
+        for chunk in stream(notes, sample_rate, **kwargs):
+            out.writeframes(to_pcm16(chunk).astype("<i2").tobytes())
@@ -0,0 +1,169 @@
+import numpy as np
+
+from ..basic import PitchClassSet
+from ..setclasses import set_class_table
+
+
+def test_prime_form_special_cases():
+    # Rahn's and Forte's prime forms differ for these set classes
+    for rahn, forte, name in [
+        ("01568", "01378", "5-20"),
+        ("023679", "013689", "6-Z29"),
+        ("014579", "013589", "6-31"),
+        ("0125679", "0124789", "7-20"),
+        ("0134578T", "0124579T", "8-26"),
+    ]:
+        for pcs in (rahn, forte):
+            s = PitchClassSet(pcs).transpose(5)
+            assert s.prime_form() == PitchClassSet(rahn)
+            assert s.forte_name() == name
+
+
+def test_prime_form_beyond_bitmasks():
+    import pytest
+
+    from ..setclasses import lookup, set_class
+
+    s = PitchClassSet([10, 14, 15], c=70)
+    assert s.prime_form() == PitchClassSet([0, 1, 5], c=70)
+    assert s.transpose(60).invert().prime_form() == s.prime_form()
+    assert set_class(s.mask, 70) == (0b100011, 15, True, 10)
+
+    small = PitchClassSet([10, 14, 15], c=40)
+    assert set_class(small.mask, 40)[1:] == set_class(s.mask, 70)[1:]
+    with pytest.raises(ValueError):
+        lookup([s.mask], 70)
+
+
+def test_normal_form():
+    assert PitchClassSet({3, 11, 2}).normal_form().pcs.tolist() == [11, 2, 3]
+    assert PitchClassSet("147T").normal_form().pcs.tolist() == [1, 4, 7, 10]
+    assert PitchClassSet({7, 10, 1, 5}).normal_form().pcs.tolist() == [5, 7, 10, 1]
+
+
+def test_set_class_table():
+    table = set_class_table(12)
+    assert len(np.unique(table.prime)) == 224
+    assert len(set(table.forte.values())) == 224
+    assert table.forte_name(0b101010110101) == "7-35"
+
+
+def test_bitset_operations():
+    from ..basic import PitchClassBitSet
+
+    s = PitchClassSet({0, 1, 4, 6})
+    b = s.to_bitset()
+    assert b.mask == 0b1010011
+    assert set(b.transpose(7)) == set(s.transpose(7).pcs)
+    assert set(b.invert(2)) == set(s.invert(2).pcs)
+    assert set(b.complement()) == set(s.complement().pcs)
+    assert b.prime_form() == PitchClassBitSet("0146")
+    assert len({b, b.transpose(12), PitchClassBitSet([6, 4, 1, 0])}) == 1
+    assert PitchClassBitSet([0, 4, 7], c=19).invert().pcs.tolist() == [0, 12, 15]
+    np.testing.assert_array_equal(b.to_vector(), s.to_vector())
+
+    top = PitchClassBitSet([0, 63], c=64).to_vector()
+    assert top.shape == (64,) and top[[0, 63]].tolist() == [1, 1] and top.sum() == 2
+
+
+def test_hashable_and_immutable():
+    import pickle
+    import pytest
+    from ..basic import PitchClass, PitchClassInterval
+
+    assert len({PitchClass(3), PitchClass(15), PitchClass(3, c=19)}) == 2
+    assert len({PitchClassInterval(7), PitchClassInterval(-5)}) == 1
+
+    s = PitchClassSet({0, 4, 7})
+    assert {s: "major"}[PitchClassSet([0, 4, 7])] == "major"
+    assert {s: "major"}[PitchClassSet([7, 4, 0])] == "major"
+    assert len({s, PitchClassSet([7, 4, 0]), PitchClassSet([4, 19, 12])}) == 1
+    assert s != PitchClassSet([0, 4, 7], c=19) and s != PitchClassSet([0, 4])
+    assert pickle.loads(pickle.dumps(s)) == s
+    assert PitchClassSet("047", c=19).transpose(2).c == 19
+    with pytest.raises(AttributeError):
+        s.c = 19
+    with pytest.raises(ValueError):
+        s.pcs[0] = 1
+    assert not hasattr(s, "__dict__")
+
+
+def test_pitch_class_set_array():
+    from ..basic import PitchClassSetArray
+    from ..scales import Scales
+
+    sets = PitchClassSetArray(Scales(c=12, d=4).all())
+    normal = sets.normal_form()
+    prime = sets.prime_form()
+    for k, s in enumerate(sets.to_pcsets()):
+        assert normal[k].tolist() == s.normal_form().pcs.tolist()
+        assert prime[k] == s.prime_form()
+    np.testing.assert_array_equal(sets.transpose(12).vectors, sets.vectors)
+    np.testing.assert_array_equal(sets.invert().invert().vectors, sets.vectors)
+    assert (sets.complement().d == 8).all()
+
+    batch = PitchClassSetArray.from_pcsets([PitchClassSet("037"), {1, 5}])
+    assert batch.normal_form().tolist() == [[0, 3, 7], [1, 5, -1]]
+    assert batch.forte_name() == ["3-11", "2-4"]
+
+
+def test_normal_form_methods():
+    from ..basic import PitchClassSetArray
+    from ..scales import Scales
+    from ..setclasses import normal_forms, set_class
+
+    # Rahn and Forte break the tie of 5-20 differently
+    s = PitchClassSet("01568")
+    assert s.normal_form().pcs.tolist() == [0, 1, 5, 6, 8]
+    assert s.normal_form(method="forte").pcs.tolist() == [5, 6, 8, 0, 1]
+
+    scales = Scales(c=12, d=5).all()
+    pcs = np.nonzero(scales)[1].reshape(-1, 5)
+    table = PitchClassSetArray(scales).normal_form()
+    np.testing.assert_array_equal(normal_forms(pcs), table)
+
+    forte = PitchClassSetArray(scales).normal_form(method="forte")
+    differ = (forte != table).any(axis=1)
+    assert {PitchClassSet(p).forte_name() for p in pcs[differ]} == {"5-20", "5-32"}
+
+    # for c > 16 the rotations are compared directly, not looked up
+    for pcs in ([0, 3, 7, 11, 14], [0, 5, 6, 11, 12, 17]):
+        s = PitchClassSet(pcs, c=19)
+        assert s.normal_form().pcs[0] == set_class(s.mask, c=19)[3]
+
+
+def test_memoized_analytics():
+    from ..cache import LRUCache, analysis_cache, clear_cache, cache_info
+
+    clear_cache()
+    diatonic = PitchClassSet("024579E")
+    diatonic.info()
+    misses = cache_info().misses
+    PitchClassSet([11, 9, 7, 5, 4, 2, 0]).info()
+    assert cache_info().misses == misses
+    assert cache_info().hits > 0
+
+    # repeated pitch classes are not the same content as the set
+    PitchClassSet([0, 4]).interval_vector()
+    misses = cache_info().misses
+    PitchClassSet([0, 0, 4]).interval_vector()
+    PitchClassSet([4, 12, 0]).interval_vector()
+    assert cache_info().misses == misses + 1
+
+    # cached arrays are handed out as copies
+    diatonic.interval_vector()[0] = 99
+    assert diatonic.interval_vector().tolist() == [2, 5, 4, 3, 6, 1]
+
+    lru = LRUCache(maxsize=2)
+    for key in "abca":
+        lru.get(key, lambda: key.upper())
+    assert lru.info() == (0, 4, 2, 2) and "b" not in lru._entries
+    assert len(analysis_cache) <= analysis_cache.maxsize
+
+
+def test_maximally_even():
+    assert PitchClassSet("024579E").maximally_even()
+    assert PitchClassSet("E03478").maximally_even() is False
+    assert PitchClassSet("0134679T").maximally_even()
+    assert PitchClassSet("02468", c=10).maximally_even()
+    assert not PitchClassSet("1234").maximally_even()
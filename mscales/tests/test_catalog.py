@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from ..catalog import Catalog, PROPERTIES, build, catalog
+from ..scales import Scales
+from ..setclasses import forte_name, lookup
+from ..utils import interval_class_vectors, is_CV, is_DE, is_G, is_ME, is_MP, to_masks
+
+
+@pytest.mark.parametrize("c, d, workers", [(12, None, 1), (12, 7, 2), (9, 4, 1)])
+def test_columns(tmp_path, c, d, workers):
+    cat = build(tmp_path, c, d, block_size=100, workers=workers)
+    scales = Scales(c, d).all()
+    masks = to_masks(scales)
+
+    assert len(cat) == scales.shape[0]
+    assert isinstance(cat["mask"], np.memmap) and not cat["mask"].flags.writeable
+    np.testing.assert_array_equal(cat.scales(), scales)
+    np.testing.assert_array_equal(cat["mask"], masks)
+    np.testing.assert_array_equal(cat["d"], scales.sum(axis=1))
+    np.testing.assert_array_equal(
+        cat["interval_vector"], interval_class_vectors(scales)
+    )
+    np.testing.assert_array_equal(cat["prime"][cat["prime_id"]], lookup(masks, c)[0])
+    assert cat["size"].sum() == len(cat)
+
+    for name, test in zip(PROPERTIES, (is_DE, is_ME, is_MP, is_CV, is_G)):
+        np.testing.assert_array_equal(cat[name], test(scales))
+
+    np.testing.assert_array_equal(cat.rows(masks[::-1]), np.arange(len(cat))[::-1])
+    if c == 12:
+        names = [forte_name(int(m)) or "" for m in masks]
+        np.testing.assert_array_equal(cat.forte_names(), names)
+
+
+def test_catalog_is_built_once(tmp_path):
+    first = catalog(tmp_path, 7, 3, workers=1)
+    mtime = (tmp_path / "mask.npy").stat().st_mtime_ns
+    again = catalog(tmp_path, 7, 3, workers=1)
+    assert (tmp_path / "mask.npy").stat().st_mtime_ns == mtime
+    assert again.metadata == first.metadata
+    assert sorted(p.name for p in tmp_path.iterdir() if "tmp" in p.name) == []
+
+    assert catalog(tmp_path, 7, 4, workers=1).d == 4
+    assert Catalog(tmp_path).d == 4
+    with pytest.raises(ValueError):
+        Catalog(tmp_path).rows([0b111])
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from ..concepts import PROPERTIES, noll_context, property_context, scale_properties
+
+
+def test_diatonic_has_all_properties():
+    diatonic = np.isin(np.arange(12), [0, 2, 4, 5, 7, 9, 11])
+    assert scale_properties(diatonic).all()
+
+
+def test_heptatonic_signatures_are_in_noll_table():
+    pytest.importorskip("concepts")
+
+    context, counts = property_context(12, 7)
+    table = {tuple(row) for row in noll_context().bools}
+
+    assert sum(counts.values()) == 792
+    assert tuple(context.properties) == PROPERTIES
+    for row in context.bools:
+        assert tuple(row) in table or not any(row)
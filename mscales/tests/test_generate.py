@@ -0,0 +1,40 @@
+import numpy as np
+
+from .. import midi
+from ..generate import filename, generate, main, render_chunk, scale_rng
+from ..sound import cloud_notes, tone_cloud
+
+
+def test_files_do_not_depend_on_workers(tmp_path):
+    serial = generate(6, 3, tmp_path / "serial", workers=1, chunk_size=4, n_notes=20)
+    pooled = generate(6, 3, tmp_path / "pooled", workers=2, chunk_size=3, n_notes=20)
+    assert serial["files"] == pooled["files"] == 20
+
+    for path in (tmp_path / "serial").iterdir():
+        assert path.read_bytes() == (tmp_path / "pooled" / path.name).read_bytes()
+
+    scale = np.array([1, 0, 1, 0, 1, 0])
+    notes = cloud_notes(scale, n_notes=20, rng=scale_rng(0b010101))
+    data = (tmp_path / "serial" / filename(scale)).read_bytes()
+    assert data == bytes(midi.encode(notes))
+
+
+def test_render_chunk_top_pitch_class(tmp_path):
+    masks = np.array([1 | 1 << 63], dtype=np.uint64)
+    assert render_chunk(masks, 64, tmp_path, n_notes=5)[0] == 1
+    scale = np.zeros(64, dtype=int)
+    scale[[0, 63]] = 1
+    assert (tmp_path / filename(scale)).exists()
+
+
+def test_cli_skips_empty_scale(tmp_path, capsys):
+    stats = main(["4", "-o", str(tmp_path), "--n-notes", "5", "--workers", "1"])
+    assert stats["files"] == len(list(tmp_path.iterdir())) == 15
+    assert "files/s" in capsys.readouterr().out
+
+
+def test_tone_cloud_seed():
+    scale = np.array([1, 0, 1, 1, 0, 1, 0, 1, 0, 1, 1, 0])
+    a = tone_cloud(scale, pretty=False, rng=7)
+    b = tone_cloud(scale, pretty=False, rng=np.random.default_rng(7))
+    assert (a.pitches == b.pitches).all()
@@ -0,0 +1,20 @@
+import subprocess
+import sys
+from pathlib import Path
+
+HEAVY_MODULES = ["matplotlib", "pretty_midi", "concepts"]
+
+
+def test_import_does_not_load_plotting_or_midi():
+    code = (
+        "import sys, mscales, mscales.concepts; "
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parents[2],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == "[]"
@@ -0,0 +1,97 @@
+import io
+
+import numpy as np
+import pytest
+
+from ..midi import Notes, encode, to_pretty_midi, write
+
+
+def random_tracks(rng, n_tracks, n_notes=40):
+    tracks = []
+    for _ in range(n_tracks):
+        starts = np.sort(rng.uniform(0, 60, n_notes))
+        ends = starts + rng.choice([0.0, 0.01, 0.5, 200.0], n_notes)
+        pitches = rng.integers(0, 128, n_notes)
+        tracks.append(Notes(pitches, starts, ends, rng.integers(1, 128, n_notes)))
+    return tracks
+
+
+@pytest.mark.parametrize("n_tracks", [1, 3, 17])
+def test_format_1_matches_pretty_midi(n_tracks):
+    pytest.importorskip("pretty_midi")
+    rng = np.random.default_rng(n_tracks)
+    tracks = random_tracks(rng, n_tracks)
+    programs = rng.integers(0, 128, n_tracks)
+
+    ref = io.BytesIO()
+    to_pretty_midi(tracks, programs, resolution=480, tempo=90.0).write(ref)
+    data = encode(tracks, programs, resolution=480, tempo=90.0)
+
+    assert isinstance(data, memoryview)
+    assert bytes(data) == ref.getvalue()
+
+
+def test_format_0_matches_merged_tracks():
+    mido = pytest.importorskip("mido")
+    pytest.importorskip("pretty_midi")
+    tracks = random_tracks(np.random.default_rng(0), 4)
+
+    ref = io.BytesIO()
+    to_pretty_midi(tracks, [0, 40, 73, 0]).write(ref)
+    ref.seek(0)
+    merged = mido.MidiFile(type=0, ticks_per_beat=220)
+    merged.tracks.append(mido.merge_tracks(mido.MidiFile(file=ref).tracks))
+    ref = io.BytesIO()
+    merged.save(file=ref)
+
+    out = io.BytesIO()
+    write(out, tracks, [0, 40, 73, 0], format=0)
+    assert out.getvalue() == ref.getvalue()
+
+
+def test_empty_track():
+    empty = Notes(*(np.array([], dtype=int) for _ in range(4)))
+    data = bytes(encode(empty, format=0))
+    assert data.startswith(b"MThd\x00\x00\x00\x06\x00\x00\x00\x01")
+    assert data.endswith(b"\x00\xc0\x00\x01\xff\x2f\x00")
+
+
+@pytest.mark.parametrize("c", [19, 24])
+def test_tuned_tracks_match_pretty_midi(c):
+    pytest.importorskip("pretty_midi")
+    rng = np.random.default_rng(c)
+    tracks = [
+        Notes(
+            rng.integers(3 * c, 7 * c, 60),
+            np.arange(60) * 0.1,
+            np.arange(1, 61) * 0.1,
+            np.full(60, 90),
+            c,
+        ),
+        Notes(
+            rng.integers(36, 84, 60),
+            np.arange(60) * 0.2,
+            np.arange(1, 61) * 0.2,
+            np.full(60, 90),
+        ),
+    ]
+
+    ref = io.BytesIO()
+    to_pretty_midi(tracks, [0, 40]).write(ref)
+    assert bytes(encode(tracks, [0, 40])) == ref.getvalue()
+
+
+def test_more_tuned_tracks_than_channels():
+    def track(pitches):
+        n = len(pitches)
+        return Notes(
+            pitches, np.arange(n) * 0.1, np.arange(1, n + 1) * 0.1, [90] * n, 24
+        )
+
+    quarter_tones = [track([97, 99, 101]) for _ in range(17)]
+    assert bytes(encode(quarter_tones)).startswith(b"MThd")
+
+    mixed = [track([96, 97, 98])] + [track([97, 99, 101])] * 16
+    with pytest.raises(ValueError):
+        encode(mixed)
+    assert bytes(encode(mixed, tuning="mts")).startswith(b"MThd")
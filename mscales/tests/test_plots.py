@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from ..basic import PitchClassSet
+from ..plots import (
+    ScaleFigure,
+    atlas_collections,
+    filename,
+    plot_atlas,
+    plot_barcode,
+    plot_polar,
+    save_all,
+)
+from ..scales import Scales
+
+pytest.importorskip("matplotlib")
+
+MAJOR = [0, 2, 4, 5, 7, 9, 11]
+
+
+def pixels(figure):
+    figure.figure.canvas.draw()
+    return np.asarray(figure.figure.canvas.buffer_rgba()).copy()
+
+
+@pytest.mark.parametrize("kind", ["barcode", "polar", "area"])
+def test_updated_figure_matches_new_figure(kind):
+    scales = Scales(12, 7).all()
+    reused = ScaleFigure(12, kind)
+    for s in scales[:5]:
+        reused.update(s)
+    assert (pixels(reused) == pixels(ScaleFigure(12, kind).update(scales[4]))).all()
+
+
+def test_plots_return_axes_without_showing(tmp_path):
+    import matplotlib.pyplot as plt
+
+    s = np.array([1, 0, 1, 1, 0, 1, 0, 1, 0, 1, 0, 1])
+    assert plot_barcode(s, save=tmp_path / "bar.png", show=False).name == "rectilinear"
+    assert plot_polar(s, save=tmp_path / "polar.png", show=False).name == "polar"
+    ax = PitchClassSet([0, 4, 7]).plot(kind="lollipop", save=tmp_path / "pcs.png")
+    assert ax.name == "polar"
+    assert all((tmp_path / f).exists() for f in ["bar.png", "polar.png", "pcs.png"])
+    plt.close("all")
+
+    with pytest.raises(ValueError):
+        ScaleFigure(12, "pie")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_save_all(tmp_path, workers):
+    import matplotlib.pyplot as plt
+
+    stats = save_all(
+        Scales(7, 3).iter_all(block_size=10),
+        tmp_path,
+        kind="polar",
+        format="svg",
+        workers=workers,
+        chunk_size=4,
+        figsize=(2, 2),
+    )
+    assert stats["files"] == 35
+    assert (tmp_path / filename([1, 1, 1, 0, 0, 0, 0], "polar", "svg")).exists()
+    assert len(list(tmp_path.iterdir())) == 35
+    assert plt.get_fignums() == []
+
+
+@pytest.mark.parametrize("kind", ["barcode", "polar", "area"])
+def test_atlas_collections(kind):
+    scales = np.vstack([Scales(12, 7).all(), np.zeros(12, dtype=int)])
+    collections, nrows, ncols = atlas_collections(scales, kind)
+    assert (nrows, ncols) == (28, 29)
+
+    # the glyph of the major scale (pitch classes 0, 2, 4, ...) in its cell
+    k = next(i for i, s in enumerate(scales) if (np.flatnonzero(s) == MAJOR).all())
+    cell = np.array([k % ncols, -(k // ncols) - 1])
+
+    if kind == "barcode":
+        bars = collections[0].get_paths()
+        assert len(bars) == 7 * 792
+        assert np.allclose(bars[7 * k].vertices[0], cell + 0.1)
+    elif kind == "polar":
+        stems = collections[1].get_segments()
+        assert len(stems) == 7 * 792
+        assert np.allclose(stems[7 * k], [cell + 0.5, cell + [0.5, 0.9]])
+    else:
+        polygons = collections[1].get_paths()
+        assert len(polygons) == 793
+        assert np.allclose(polygons[k].vertices[0], cell + [0.5, 0.9])
+        assert np.allclose(polygons[-1].vertices, polygons[-1].vertices[0])
+
+
+def test_plot_atlas(tmp_path):
+    import matplotlib.pyplot as plt
+
+    scales = Scales(7, 3).all()
+    ax = plot_atlas(
+        scales,
+        "area",
+        labels=[filename(s) for s in scales],
+        show=False,
+        save=tmp_path / "atlas.png",
+    )
+    assert len(ax.collections) == 2 and len(ax.texts) == 35
+    assert (tmp_path / "atlas.png").exists()
+    plt.close("all")
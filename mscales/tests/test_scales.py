@@ -0,0 +1,64 @@
+import numpy as np
+from itertools import product
+from math import comb
+
+from ..scales import Scales
+
+
+def test_fixed_cardinality_matches_product():
+    for c in range(1, 11):
+        full = np.asarray(list(product([0, 1], repeat=c)))
+        for d in range(c + 1):
+            scales = Scales(c=c, d=d).all()
+            assert scales.dtype == np.uint8
+            np.testing.assert_array_equal(scales, full[full.sum(axis=1) == d])
+
+
+def test_packed_scales():
+    s = Scales(c=19, d=7)
+    packed = s.all(packed=True)
+    assert packed.shape == (comb(19, 7), 3)
+    np.testing.assert_array_equal(np.unpackbits(packed, axis=1)[:, :19], s.all())
+
+
+def test_iter_all_blocks():
+    s = Scales(c=14, d=5)
+    blocks = list(s.iter_all(block_size=500))
+    assert all(block.shape == (500, 14) for block in blocks[:-1])
+    np.testing.assert_array_equal(np.concatenate(blocks), s.all())
+    assert sum(len(b) for b in s.iter_pitch_classes(block_size=500)) == comb(14, 5)
+
+
+def test_interval_class_vectors():
+    from ..basic import PitchClassSet
+
+    for c in (7, 12):
+        s = Scales(c=c)
+        icv = s.interval_class_vectors()
+        assert icv.shape == (2**c, c // 2)
+        for pcs, iv in zip(s.pitch_classes(), icv):
+            np.testing.assert_array_equal(iv, PitchClassSet(pcs, c=c).interval_vector())
+
+
+def test_necklaces_and_bracelets():
+    from ..setclasses import lookup
+    from ..utils import rotate_mask, to_masks
+
+    for c in (7, 12):
+        for d in (None, 0, 5, c):
+            s = Scales(c=c, d=d)
+            masks = to_masks(s.all())
+            transposition = np.min([rotate_mask(masks, n, c) for n in range(c)], 0)
+
+            for (scales, counts), classes in [
+                (s.necklaces(), transposition),
+                (s.bracelets(), lookup(masks, c)[0]),
+            ]:
+                representatives, sizes = np.unique(classes, return_counts=True)
+                order = np.argsort(to_masks(scales))
+                np.testing.assert_array_equal(to_masks(scales)[order], representatives)
+                np.testing.assert_array_equal(counts[order], sizes)
+
+    assert Scales(c=12).necklaces()[0].shape == (352, 12)
+    assert Scales(c=12).bracelets()[0].shape == (224, 12)
+    assert Scales(c=12, d=7).bracelets()[1].sum() == comb(12, 7)
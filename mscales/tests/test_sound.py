@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from ..basic import PitchClassSet
+from ..midi import GM_INSTRUMENTS, Notes
+from ..sound import cloud_notes, render, tone_cloud
+
+DIATONIC = np.isin(np.arange(12), [0, 2, 4, 5, 7, 9, 11]).astype(int)
+
+
+def legacy_tone_cloud(scale, rng, n_notes=100, note_duration=0.15, velocity=100):
+    """The original pretty_midi implementation of `tone_cloud`."""
+    pm = pytest.importorskip("pretty_midi")
+
+    starts = np.arange(n_notes) * note_duration
+    ends = starts + note_duration
+    pitches = [x for x in rng.choice(np.nonzero(scale)[0], size=n_notes)]
+    octaves = rng.choice(np.arange(3, 7), size=n_notes)
+    midi_pitches = [(p + 12 * o) for p, o in list(zip(pitches, octaves))]
+
+    midi = pm.PrettyMIDI()
+    instrument = pm.Instrument(program=0)
+    for mp, s, e in zip(midi_pitches, starts, ends):
+        instrument.notes.append(pm.Note(pitch=mp, velocity=velocity, start=s, end=e))
+    midi.instruments.append(instrument)
+    return midi
+
+
+def test_tone_cloud_matches_pretty_midi(tmp_path):
+    legacy = legacy_tone_cloud(DIATONIC, np.random.default_rng(0), n_notes=500)
+    legacy.write(str(tmp_path / "legacy.mid"))
+
+    notes = cloud_notes(DIATONIC, n_notes=500, rng=np.random.default_rng(0))
+    assert isinstance(notes, Notes) and len(notes) == 500
+
+    render(notes, "Acoustic Grand Piano", save_as=str(tmp_path / "cloud.mid"))
+    assert (tmp_path / "cloud.mid").read_bytes() == (
+        tmp_path / "legacy.mid"
+    ).read_bytes()
+
+
+def test_play_returns_notes_without_pretty_midi():
+    notes = PitchClassSet([0, 4, 7]).play(mode="chord", pretty=False)
+    assert notes.pitches.tolist() == [48, 52, 55]
+    assert (notes.starts == 0).all() and (notes.ends == 0.15).all()
+
+
+def test_general_midi_instruments():
+    pm = pytest.importorskip("pretty_midi")
+    assert list(GM_INSTRUMENTS) == pm.constants.INSTRUMENT_MAP
+
+
+def test_tone_cloud_returns_pretty_midi_on_request():
+    pytest.importorskip("pretty_midi")
+    midi = tone_cloud(DIATONIC, n_notes=20)
+    assert len(midi.instruments[0].notes) == 20
+    assert isinstance(tone_cloud(DIATONIC, n_notes=20, pretty=False), Notes)
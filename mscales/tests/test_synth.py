@@ -0,0 +1,41 @@
+import wave
+
+import numpy as np
+
+from ..midi import Notes
+from ..sound import cloud_notes
+from ..synth import render, write_wav
+
+
+def peak_frequency(samples, sample_rate=44100):
+    spectrum = np.abs(np.fft.rfft(samples))
+    return np.argmax(spectrum) * sample_rate / samples.shape[0]
+
+
+def test_edo_frequencies():
+    a4 = Notes(np.array([69]), np.array([0.0]), np.array([1.0]), np.array([100]))
+    assert peak_frequency(render(a4)) == 440
+
+    # pitch class 11 of 19-EDO in octave 4
+    note = Notes(
+        np.array([4 * 19 + 11]), np.array([0.0]), np.array([1.0]), np.array([100]), 19
+    )
+    expected = 440 * 2 ** (-69 / 12) * 2 ** (4 + 11 / 19)
+    assert abs(peak_frequency(render(note)) - expected) <= 1
+
+
+def test_chunks_and_wav(tmp_path):
+    scale = np.zeros(24, dtype=int)
+    scale[[0, 4, 7, 11, 14, 18, 21]] = 1
+    notes = cloud_notes(scale, n_notes=50, rng=0)
+
+    samples = render(notes)
+    assert samples.dtype == np.float32 and samples.shape[0] == round(7.5 * 44100)
+    assert np.array_equal(samples, render(notes, chunk_size=1000))
+    assert np.abs(samples).max() <= 1
+
+    write_wav(tmp_path / "cloud.wav", notes, chunk_size=4096)
+    with wave.open(str(tmp_path / "cloud.wav")) as f:
+        assert (f.getnchannels(), f.getsampwidth(), f.getframerate()) == (1, 2, 44100)
+        pcm = np.frombuffer(f.readframes(f.getnframes()), dtype="<i2")
+    assert np.array_equal(pcm, render(notes, dtype="int16"))
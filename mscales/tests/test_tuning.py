@@ -0,0 +1,95 @@
+import io
+
+import numpy as np
+import pytest
+
+from ..basic import PitchClassSet
+from ..midi import encode
+from ..sound import cloud_notes
+from ..tuning import CENTER, allocate, mts_keys, table, to_midi
+
+
+@pytest.mark.parametrize("c", [5, 12, 19, 24, 31, 53])
+def test_table_is_nearest_note_and_bend(c):
+    pitches = np.arange(4 * c)
+    notes, bends, classes = to_midi(pitches, c)
+    semitones = notes + (bends - CENTER) / CENTER * 2
+
+    assert np.allclose(semitones, 12 * pitches / c, atol=2 / CENTER)
+    assert (semitones - notes >= -0.5).all() and (semitones - notes <= 0.5).all()
+    assert (table(c).values[classes] == bends).all()
+    assert table(c).values.shape[0] == c // np.gcd(c, 12)
+
+
+@pytest.mark.parametrize("n_channels, overlap", [(1, 0.0), (4, 0.0), (15, 0.5)])
+def test_allocate_keeps_bends_of_sounding_notes(n_channels, overlap):
+    rng = np.random.default_rng(n_channels)
+    if overlap:
+        starts = np.sort(rng.uniform(0, 10, 200))
+        ends = starts + rng.uniform(0.1, overlap, 200)
+    else:
+        starts = np.arange(200) * 0.1
+        ends = np.append(starts[1:], 20.0)
+    bends = to_midi(rng.integers(0, 31 * 8, 200), 31)[1]
+
+    channels, times, retuned, values = allocate(starts, ends, bends, n_channels)
+    assert ((channels >= 0) & (channels < n_channels)).all()
+
+    # the bend of the channel of each note when it starts, kept until it ends
+    for i in range(200):
+        mine = (retuned == channels[i]) & (times <= starts[i])
+        current = values[mine][-1] if mine.any() else CENTER
+        later = (retuned == channels[i]) & (times > starts[i]) & (times < ends[i])
+        assert current == bends[i] and not later.any()
+
+
+def test_allocate_refuses_to_retune_sounding_notes():
+    bends = to_midi(np.arange(20), 31)[1]
+    with pytest.raises(ValueError, match="mts"):
+        allocate(np.zeros(20), np.ones(20), bends, 15)
+
+    chord = PitchClassSet(range(20), c=31).play(mode="chord", pretty=False)
+    with pytest.raises(ValueError):
+        encode(chord)
+    assert bytes(encode(chord, tuning="mts")).startswith(b"MThd")
+
+
+def test_static_allocation_for_few_bends():
+    bends = to_midi(np.arange(48), 24)[1]
+    channels, times, retuned, values = allocate(np.zeros(48), np.ones(48), bends, 15)
+    assert set(channels.tolist()) == {0, 1}
+    assert (times == 0).all() and values.tolist() == [10240]
+
+
+def test_mts_keys_are_distinct_and_near():
+    distinct, keys, index = mts_keys(12 * np.arange(128) / 24)
+    assert (np.diff(keys) > 0).all() and keys[0] >= 0 and keys[-1] <= 127
+    assert (np.abs(keys - distinct) < 64).all()
+    with pytest.raises(ValueError):
+        mts_keys(np.arange(129) / 2)
+
+
+@pytest.mark.parametrize("tuning", ["bend", "mts"])
+def test_19_edo_cloud_sounds_in_tune(tuning):
+    mido = pytest.importorskip("mido")
+    scale = np.ones(19, dtype=int)
+    notes = cloud_notes(scale, 300, rng=np.random.default_rng(0))
+    data = bytes(encode(notes, tuning=tuning))
+
+    bend = np.full(16, CENTER)
+    key_tuning = np.arange(128, dtype=float)
+    played = []
+    for message in mido.merge_tracks(mido.MidiFile(file=io.BytesIO(data)).tracks):
+        if message.type == "pitchwheel":
+            bend[message.channel] = message.pitch + CENTER
+        elif message.type == "sysex":
+            entries = np.array(message.data[6:]).reshape(-1, 4)
+            key_tuning[entries[:, 0]] = entries[:, 1] + (
+                entries[:, 2] * 128 + entries[:, 3]
+            ) / (1 << 14)
+        elif message.type == "note_on" and message.velocity > 0:
+            played.append(
+                key_tuning[message.note] + (bend[message.channel] - CENTER) / 4096
+            )
+
+    assert np.allclose(played, 12 * notes.pitches / 19, atol=1e-3)
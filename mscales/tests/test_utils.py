@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from ..basic import PitchClassSet
+from ..scales import Scales
+from ..utils import (
+    G,
+    J,
+    binary,
+    generator_family,
+    generators,
+    invmod,
+    is_DE,
+    is_G,
+    is_ME,
+    is_MP,
+    is_CV,
+    spectra,
+    to_mask,
+)
+
+
+def test_maximally_even_matches_J_sets():
+    for c in range(1, 15):
+        for d in range(1, c + 1):
+            scales = Scales(c=c, d=d).all()
+            j_sets = {tuple(J(np.arange(d), c, d, m)) for m in range(c)}
+            found = {tuple(np.flatnonzero(s)) for s in scales[is_ME(scales)]}
+            assert found == j_sets, (c, d)
+
+
+def test_spectra_of_all_scales():
+    for c in (7, 12):
+        scales = Scales(c=c).all()
+        sizes, widths = spectra(scales)
+        for s, n, w in zip(scales, sizes, widths):
+            pcs = np.flatnonzero(s)
+            for i in range(len(pcs)):
+                spec = {(k - j) % c for j, k in zip(pcs, np.roll(pcs, -i))}
+                assert n[i] == len(spec) and w[i] == max(spec) - min(spec)
+
+        d = scales.sum(axis=1)
+        mp = [set(n[1:k]) == {2} for n, k in zip(sizes, d)]
+        assert (is_MP(scales) == np.array(mp)).all()
+
+
+def test_myhill_and_cardinality_equals_variety():
+    diatonic = [0, 2, 4, 5, 7, 9, 11]
+    assert is_MP(np.isin(np.arange(12), diatonic))
+    assert is_CV(np.isin(np.arange(12), diatonic))
+    assert not is_MP(np.isin(np.arange(12), [0, 2, 4, 6, 8, 10]))
+    assert not is_CV(np.isin(np.arange(12), [0, 1, 2, 4, 6, 8, 10]))
+
+
+def test_generators_match_stacks():
+    for c in range(1, 11):
+        scales = Scales(c=c).all()
+        generated, transpositions, rotations = generators(scales)
+        for g in range(1, c):
+            stacks = {
+                to_mask((t + g * k) % c for k in range(d))
+                for d in range(1, c + 1)
+                for t in range(c)
+                if len({g * k % c for k in range(d)}) == d
+            }
+            for s, found, t, r in zip(
+                scales, generated[:, g], transpositions[:, g], rotations[:, g]
+            ):
+                assert found == (to_mask(np.flatnonzero(s)) in stacks), (c, g, s)
+                if found:
+                    d = s.sum()
+                    assert to_mask((t + g * k) % c for k in range(d)) == to_mask(
+                        np.flatnonzero(s)
+                    )
+                    assert np.flatnonzero(s)[r] == t
+
+
+def test_generators_of_diatonic_and_whole_tone():
+    diatonic = np.isin(np.arange(12), [2, 4, 5, 7, 9, 11, 0]).astype(int)
+    generated, transpositions, rotations = generators(diatonic)
+    assert np.flatnonzero(generated).tolist() == [5, 7]
+    assert (transpositions[7], rotations[7]) == (5, 3)  # F C G D A E B
+    assert (transpositions[5], rotations[5]) == (11, 6)  # B E A D G C F
+
+    whole_tone = np.tile([1, 0], 6)
+    assert np.flatnonzero(generators(whole_tone)[0]).tolist() == [2, 10]
+    assert is_G(np.roll(diatonic, 1)) and not is_G(np.array([1, 1, 0, 1, 0, 0]))
+
+
+def test_invmod():
+    assert invmod(7, 12) == 7 and invmod(5, 19) == 4
+    with pytest.raises(ValueError):
+        invmod(4, 12)
+
+
+def test_generator_family():
+    for c in range(1, 25):
+        family = generator_family(c)
+        assert family.shape == (c + 1, c // 2 + 1, c)
+        for d in range(c + 1):
+            for g in range(c):
+                stack = {g * x % c for x in range(d)}
+                assert np.flatnonzero(G(c, d, g)).tolist() == sorted(stack)
+
+
+def test_generator_family_is_saved(tmp_path):
+    family = generator_family(31, cache_dir=tmp_path)
+    assert (tmp_path / "generator_family_31.npy").exists()
+    loaded = generator_family(31, cache_dir=tmp_path)
+    assert isinstance(loaded, np.memmap) and (loaded == family).all()
+
+
+def test_distributional_evenness_matches_spectra():
+    for c in (7, 9, 12):
+        scales = Scales(c=c).all()
+        de = is_DE(scales)
+        for s, found in zip(scales[1:], de[1:]):
+            pcs = PitchClassSet(np.flatnonzero(s), c=c)
+            spectra = [pcs.spectrum(i) for i in range(pcs.d)]
+            assert found == all(len(sizes) <= 2 for sizes in spectra), (c, s)
+        assert not de[0]
+
+    # the step from 3 back to 0 is a third size
+    assert not is_DE(binary([0, 1, 3], 12))
+    assert is_DE(binary([0, 2, 4, 5, 7, 9, 11], 12))
@@ -0,0 +1,214 @@
+"""
+Tuning of c-EDO pitches for MIDI.
+
+Pitch p of c-EDO (p steps above C-1) sounds 12 * p / c semitones above MIDI
+note 0. For MIDI it is played either as the nearest MIDI note bent by a
+pitch-bend message of its channel, or as a key retuned by MIDI Tuning
+Standard (MTS) single-note tuning changes.
+
+Pitch-bend is per channel, so notes with different bends cannot share a
+channel while they sound. The bends of c-EDO only depend on the pitch class,
+which gives at most c / gcd(c, 12) distinct bends: when they fit in the
+available channels, each bend gets a channel of its own, retuned once at the
+start; otherwise channels are retuned when a note starts, preferring a
+channel that already has the right bend and then the one idle for longest.
+A channel is never retuned while one of its notes sounds: if more bends
+sound at once than there are channels, MTS tuning is needed instead.
+
+The nearest notes and bends of all pitch classes are looked up in a table
+that is computed once per c.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+# pitch-bend range in semitones, the General MIDI default
+BEND_RANGE = 2
+
+# 14-bit pitch-bend value of no bend
+CENTER = 8192
+
+
+class Table(NamedTuple):
+    """
+    MIDI tuning of the pitch classes of c-EDO in octave 0 (starting at C-1).
+
+    `notes` are the nearest MIDI notes and `bends` the 14-bit pitch-bend
+    values; `values` are the distinct bends, sorted, and `classes` the index
+    of the bend of each pitch class in `values`.
+    """
+
+    notes: np.ndarray
+    bends: np.ndarray
+    values: np.ndarray
+    classes: np.ndarray
+
+
+@lru_cache(maxsize=None)
+def table(c: int, bend_range: float = BEND_RANGE) -> Table:
+    """The (read-only) tuning table of c-EDO, see `Table`."""
+    semitones = 12 * np.arange(c) / c
+    # halves round down, so that quarter tones all bend up
+    notes = np.ceil(semitones - 0.5).astype(np.int64)
+    bends = CENTER + np.rint((semitones - notes) / bend_range * CENTER)
+    bends = np.clip(bends, 0, 2 * CENTER - 1).astype(np.int64)
+    values, classes = np.unique(bends, return_inverse=True)
+
+    result = Table(notes, bends, values, classes.reshape(-1))
+    for array in result:
+        array.flags.writeable = False
+    return result
+
+
+def semitones(pitches, c: int = 12) -> np.ndarray:
+    """Pitches of c-EDO as (fractional) MIDI note numbers."""
+    return 12 * np.asarray(pitches) / c
+
+
+def to_midi(pitches, c: int = 12, bend_range: float = BEND_RANGE):
+    """
+    Nearest MIDI notes and pitch-bend values of pitches of c-EDO.
+
+    Returns
+    -------
+    tuple
+        MIDI notes, 14-bit bends and the bend classes (see `Table`)
+    """
+    tuning = table(c, bend_range)
+    octaves, pcs = np.divmod(np.asarray(pitches, dtype=np.int64), c)
+    notes = tuning.notes[pcs] + 12 * octaves
+    assert ((notes >= 0) & (notes < 128)).all(), "Pitches out of the MIDI range."
+    return notes, tuning.bends[pcs], tuning.classes[pcs]
+
+
+def allocate(starts, ends, bends, n_channels: int):
+    """
+    Distributes notes with pitch-bends `bends` over `n_channels` channels.
+
+    A channel is only retuned once its notes have ended.
+
+    Returns
+    -------
+    tuple
+        channel of each note (0 to `n_channels` - 1), and the times,
+        channels and values of the pitch-bend messages, which leave the
+        channels at `CENTER` until their first message
+
+    Raises
+    ------
+    ValueError
+        if more than `n_channels` different bends sound at the same time
+    """
+    starts = np.asarray(starts)
+    values, classes = np.unique(np.asarray(bends, dtype=np.int64), return_inverse=True)
+    classes = classes.reshape(-1)
+
+    if values.shape[0] <= n_channels:
+        retuned = np.flatnonzero(values != CENTER)
+        return (
+            classes,
+            np.zeros(retuned.shape[0]),
+            retuned,
+            values[retuned],
+        )
+
+    channels = np.empty(starts.shape[0], dtype=np.int64)
+    current = [CENTER] * n_channels
+    busy_until = [-np.inf] * n_channels
+    times, retuned, messages = [], [], []
+    for i in np.argsort(starts, kind="stable").tolist():
+        start, bend = starts[i], int(values[classes[i]])
+        if bend in current:
+            channel = current.index(bend)
+        else:
+            # the channel idle for longest (or the first to be released)
+            channel = busy_until.index(min(busy_until))
+            if busy_until[channel] > start:
+                raise ValueError(
+                    f"More than {n_channels} different pitch-bends sound at once "
+                    f"at {start}; use tuning='mts' instead."
+                )
+            current[channel] = bend
+            times.append(start)
+            retuned.append(channel)
+            messages.append(bend)
+        channels[i] = channel
+        busy_until[channel] = max(busy_until[channel], ends[i])
+
+    return (
+        channels,
+        np.array(times, dtype=float),
+        np.array(retuned, dtype=np.int64),
+        np.array(messages, dtype=np.int64),
+    )
+
+
+def mts_keys(tunings):
+    """
+    Keys to retune to the (fractional) MIDI notes `tunings`, in increasing
+    order and as near to the tunings as possible.
+
+    Returns
+    -------
+    tuple
+        the distinct tunings, sorted, their keys, and the index of each of
+        `tunings` among the distinct ones
+    """
+    tunings = np.round(np.asarray(tunings, dtype=float), 9)
+    distinct, index = np.unique(tunings, return_inverse=True)
+    if distinct.shape[0] > 128:
+        raise ValueError(
+            f"MTS retunes at most 128 keys, got {distinct.shape[0]} pitches."
+        )
+
+    # key i is at least key i - 1 + 1, i.e. keys - i is non-decreasing
+    n = distinct.shape[0]
+    ranks = np.arange(n)
+    keys = np.maximum.accumulate(np.rint(distinct).astype(np.int64) - ranks) + ranks
+    if n:
+        keys -= max(keys[-1] - 127, 0)
+        keys = np.maximum(keys, ranks)
+    return distinct, keys, index.reshape(-1)
+
+
+def mts_sysex(keys, tunings, device: int = 0x7F, program: int = 0) -> bytes:
+    """
+    MTS real-time single-note tuning changes of `keys` to the (fractional)
+    MIDI notes `tunings`, as System Exclusive events of a MIDI file at tick 0.
+
+    Each message retunes at most 127 keys; keys already at their tuning are
+    left out.
+    """
+    keys = np.asarray(keys, dtype=np.int64)
+    tunings = np.asarray(tunings, dtype=float)
+
+    semitone = np.floor(tunings).astype(np.int64)
+    fraction = np.rint((tunings - semitone) * (1 << 14)).astype(np.int64)
+    semitone += fraction >> 14
+    fraction &= (1 << 14) - 1
+
+    changed = (keys != semitone) | (fraction != 0)
+    data = np.stack([keys, semitone, fraction >> 7, fraction & 0x7F], axis=1)
+    data = data[changed].astype(np.uint8)
+
+    out = b""
+    for start in range(0, data.shape[0], 127):
+        entries = data[start : start + 127]
+        payload = (
+            bytes([0x7F, device, 0x08, 0x02, program, entries.shape[0]])
+            + entries.tobytes()
+            + b"\xf7"
+        )
+        out += b"\x00\xf0" + _vlq_bytes(len(payload)) + payload
+    return out
+
+
+def _vlq_bytes(value: int) -> bytes:
+    """A variable-length quantity."""
+    out = [value & 0x7F]
+    while value > 0x7F:
+        value >>= 7
+        out.append(0x80 | (value & 0x7F))
+    return bytes(reversed(out))
@@ -1,6 +1,10 @@
-import numpy as np
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
 from math import gcd
 
+import numpy as np
+
 
 def G(c: int, d: int, g: int) -> np.ndarray:
     """
@@ -8,6 +12,9 @@ def G(c: int, d: int, g: int) -> np.ndarray:
     Generator size is g specific (chromatic) steps.
     Notation G(c, d, g) after Wooldridge (1992) and Clough et al. (1999).
 
+    The scale is looked up in `generator_family`; generators above c / 2
+    give the inversion of the scale of c - g.
+
     Parameters
     ----------
     c : int
@@ -17,61 +24,381 @@ def G(c: int, d: int, g: int) -> np.ndarray:
     g : int
         generator size
     """
-    specific_steps = np.array(sorted(list(set([(g * x) % c for x in range(d)]))))
+    g %= c
+    family = generator_family(c)[min(d, c)]
+    if g <= c // 2:
+        return family[g].astype(int)
+    return family[c - g][-np.arange(c) % c].astype(int)
+
+
+@lru_cache(maxsize=None)
+def _generator_family(c: int) -> np.ndarray:
+    # first[g, p]: the smallest x with g * x = p (mod c), or c if there is none
+    g = np.arange(c // 2 + 1)
+    steps = (g[:, None] * np.arange(c)) % c
+    first = np.full((g.shape[0], c), c)
+    rows = np.repeat(g, c)
+    np.minimum.at(first, (rows, steps.reshape(-1)), np.tile(np.arange(c), g.shape[0]))
+
+    family = first[None] < np.arange(c + 1)[:, None, None]
+    family.flags.writeable = False
+    return family
+
+
+def generator_family(c: int, cache_dir=None) -> np.ndarray:
+    """
+    All scales G(c, d, g) of a universe, as one array.
+
+    Entry [d, g, p] tells whether pitch class p is among the first d
+    multiples of g (mod c). Only the generators 0 <= g <= c / 2 are stored:
+    c - g generates the inversions of the scales of g. For g not coprime to
+    c, the scales stop growing once they fill the subgroup of gcd(g, c), at
+    d = c / gcd(g, c). The table is computed once per process and, if
+    `cache_dir` is given, saved there as ``generator_family_{c}.npy`` and
+    loaded from it in later runs.
+
+    Parameters
+    ----------
+    c : int
+        chromatic cardinality
+    cache_dir : str, optional
+        directory of the saved tables, by default None (not saved)
+
+    Returns
+    -------
+    np.ndarray
+        read-only boolean array of shape (c + 1, c // 2 + 1, c)
+    """
+    if cache_dir is None:
+        return _generator_family(c)
+
+    path = os.path.join(cache_dir, f"generator_family_{c}.npy")
+    shape = (c + 1, c // 2 + 1, c)
+    if os.path.exists(path):
+        family = np.load(path, mmap_mode="r")
+        if family.shape == shape and family.dtype == bool:
+            return family
+
+    family = _generator_family(c)
+    os.makedirs(cache_dir, exist_ok=True)
+    # written under a temporary name first, so that readers never see a
+    # partial file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, family)
+    os.replace(tmp, path)
+    return family
+
+
+def generators(s: np.ndarray):
+    """
+    Generators, transpositions and rotations of scale(s), vectorized.
+
+    A scale with d pitch classes is generated by g if it is the stack
+    {t, t + g, ..., t + (d - 1) g} (mod c) of d distinct pitch classes. The
+    multiples of g split the pitch classes into gcd(g, c) cycles of
+    c / gcd(g, c) pitch classes (r, r + g, r + 2g, ...), and the scale is
+    generated by g iff it is a single arc of one of these cycles. For g
+    coprime to c this is the arc test of the scale multiplied by the inverse
+    of g; otherwise the scale lies in a coset of the divisor gcd(g, c).
+
+    A pitch class p of the scale starts an arc iff p - g is not in the scale,
+    so the scale is generated by g iff exactly one p starts an arc (the
+    transposition t) and d < c / gcd(g, c), or none does and the scale fills
+    one cycle, d = c / gcd(g, c). Each generator costs O(c) per scale, and
+    c - g is read off g.
+
+    Parameters
+    ----------
+    s : np.ndarray
+        scale of length c, or (n_scales x c) matrix of scales
+
+    Returns
+    -------
+    tuple
+        boolean matrix of whether each g (column, 0 <= g < c) generates each
+        scale, the transpositions t (the lowest pitch class if the scale
+        fills a cycle) and the rotations, i.e. the index of t among the
+        sorted pitch classes of the scale (-1 where g is no generator)
+    """
+    s = np.asarray(s)
+    scales = np.atleast_2d(s) > 0
+    n, c = scales.shape
+    d = scales.sum(axis=1)
+
+    generated = np.zeros((n, c), dtype=bool)
+    transpositions = np.full((n, c), -1)
+    rotations = np.full((n, c), -1)
+    lowest = scales.argmax(axis=1)
+
+    # c - g generates the same stacks as g, read from their other end
+    for g in range(1, c // 2 + 1):
+        cycle = c // gcd(g, c)
+        starts = scales & ~np.roll(scales, g, axis=1)
+        n_starts = np.count_nonzero(starts, axis=1)
+        arc = (n_starts == 1) & (d < cycle)
+        found = np.flatnonzero(arc | ((n_starts == 0) & (d == cycle)))
+        if found.shape[0] == 0:
+            continue
+
+        t = np.where(arc[found], starts[found].argmax(axis=1), lowest[found])
+        end = np.where(arc[found], (t + (d[found] - 1) * g) % c, t)
+        degrees = np.cumsum(scales[found], axis=1) - 1
+        for h, start in ((g, t), (c - g, end)):
+            generated[found, h] = True
+            transpositions[found, h] = start
+            rotations[found, h] = degrees[np.arange(found.shape[0]), start]
+
+    if s.ndim > 1:
+        return generated, transpositions, rotations
+    return generated[0], transpositions[0], rotations[0]
+
+
+def is_G(s: np.ndarray):
+    """
+    Tests whether scale(s) are generated, in any transposition.
+
+    Parameters
+    ----------
+    s : np.ndarray
+        scale of length c, or (n_scales x c) matrix of scales
 
-    g = np.zeros(c, dtype=int)
-    g[specific_steps] += 1
+    Returns
+    -------
+    bool or np.ndarray
+        truth value(s)
+    """
+    generated = generators(s)[0].any(axis=-1)
+    return generated if np.ndim(s) > 1 else bool(generated)
 
-    return g
 
+def invmod(a: int, c: int) -> int:
+    """
+    Inverse of `a` modulo `c`.
 
-# test for given scale whether generated
+    Raises
+    ------
+    ValueError
+        if `a` and `c` are not coprime
+    """
+    if gcd(a, c) != 1:
+        raise ValueError(f"{a} has no inverse modulo {c}, gcd is {gcd(a, c)}.")
+    return pow(a, -1, c)
 
 
-def is_G(s: np.ndarray) -> bool:
-    # TODO: does not work for transpositions!
+def is_DE(s: np.ndarray):
     """
-    Tests whether scale is generated.
+    Tests whether scale(s) are distributionally even: each generic interval
+    comes in either one or two specific sizes.
+
+    All generic intervals are measured around the octave, for a whole matrix
+    of scales at once (see `spectra`).
 
     Parameters
     ----------
     s : np.ndarray
-        Scale
+        scale of length c, or (n_scales x c) matrix of scales
 
     Returns
     -------
-    bool
-        Truth value
+    bool or np.ndarray
+        truth value(s)
     """
+    s = np.asarray(s)
+    sizes, _, _ = _generic_intervals(s)
+    d = (np.atleast_2d(s) > 0).sum(axis=1)
+    de = (sizes <= 2).all(axis=1) & (d > 0)
+    return de if s.ndim > 1 else bool(de[0])
+
 
-    c = s.shape[0]
-    d = int(s.sum())
-    specific_steps = pcset(s)
+def interval_class_vectors(s: np.ndarray) -> np.ndarray:
+    """
+    Interval-class vectors of a scale or of a whole matrix of scales.
 
-    g = invmod(specific_steps, c)
+    The number of pairs of pitch classes spanning interval k is the circular
+    autocorrelation of the binary vector at lag k, which is computed for all
+    rows at once via the FFT.
 
-    return np.array_equal(G(c, d, g), s)
+    Parameters
+    ----------
+    s : np.ndarray
+        scale of length c, or (n_scales x c) matrix of scales
 
+    Returns
+    -------
+    np.ndarray
+        interval-class vector(s) of length c // 2
+    """
+    s = np.asarray(s)
+    scales = np.atleast_2d(s)
+    c = scales.shape[-1]
 
-def invmod(arr, c):
-    gcd_ = gcd(*arr, c)
-    if gcd_ != 1:
-        return gcd_
+    if c < 2:
+        icv = np.zeros((scales.shape[0], 0), dtype=int)
     else:
-        for g in range(2, c + 1):
-            for i in arr:
-                if (i % c) * (g % c) % c == 1:
-                    return g
-        raise Exception("The modular inverse does not exist.")
+        spectrum = np.fft.rfft(scales, axis=-1)
+        autocorrelation = np.fft.irfft(spectrum * spectrum.conj(), n=c, axis=-1)
+        icv = np.rint(autocorrelation[:, 1 : c // 2 + 1]).astype(int)
+        if c % 2 == 0:
+            # the tritone (c / 2) is counted from both of its pitch classes
+            icv[:, -1] //= 2
+
+    return icv if s.ndim > 1 else icv[0]
+
+
+def is_ME(s: np.ndarray):
+    """
+    Tests whether scale(s) are maximally even, in O(c) per scale.
+
+    A scale with sorted pitch classes s_0 < ... < s_{d-1} is maximally even iff
+    it is a J-function set (Clough & Douthett 1991), i.e. s_k = J(k, c, d, m)
+    for all k and some 0 <= m < c. Inverting the floor function, every k
+    requires d * s_k - c * k <= m <= d * s_k - c * k + d - 1, so the scale is
+    maximally even iff these intervals intersect within [0, c - 1].
+
+    Parameters
+    ----------
+    s : np.ndarray
+        scale of length c, or (n_scales x c) matrix of scales
+
+    Returns
+    -------
+    bool or np.ndarray
+        truth value(s)
+    """
+    s = np.asarray(s)
+    scales = np.atleast_2d(s) > 0
+    c = scales.shape[-1]
+    d = scales.sum(axis=-1)
+
+    # k is the (generic) index of each pitch class j in its scale
+    k = np.cumsum(scales, axis=-1) - 1
+    a = d[:, None] * np.arange(c) - c * k
+    bound = 2 * c * c + 1
+    lo = np.maximum(np.where(scales, a, -bound).max(axis=-1, initial=-bound), 0)
+    hi = np.where(scales, a, bound).min(axis=-1, initial=bound) + d - 1
 
+    me = (lo <= np.minimum(hi, c - 1)) | (d == 0)
 
-def is_DE(s: np.ndarray) -> bool:
-    """Each generic interval comes in either one or two specific sizes."""
+    return me if s.ndim > 1 else bool(me[0])
 
-    arr = pcset(s)
-    diff = np.abs(arr[:-1] - arr[1:])
 
-    return 1 <= len(set(diff)) <= 2
+def _popcount(masks: np.ndarray) -> np.ndarray:
+    """Number of set bits of each uint64 bitmask (SWAR bit counting)."""
+    m = np.asarray(masks, dtype=np.uint64)
+    m = m - ((m >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    m = (m & np.uint64(0x3333333333333333)) + (
+        (m >> np.uint64(2)) & np.uint64(0x3333333333333333)
+    )
+    m = (m + (m >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((m * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(int)
+
+
+def _generic_intervals(s: np.ndarray, varieties: bool = False):
+    """
+    Spectra (and pattern varieties) of all generic intervals of many scales.
+
+    Scales are grouped by cardinality d, so that their sorted pitch classes
+    form a matrix P with one row per scale. For each generic interval i, the
+    specific sizes are P[:, j + i] - P[:, j], continuing P by P + c beyond d.
+    Both the set of sizes and the interval pattern of the i steps following each
+    pitch class are encoded as bitmasks (hence c <= 64).
+
+    Returns
+    -------
+    tuple
+        (n_scales x c) matrices of the number of specific sizes, the spectrum
+        width (largest minus smallest size) and, if `varieties`, the number
+        of distinct patterns for each generic interval i (zero for i >= d)
+    """
+    scales = np.atleast_2d(np.asarray(s)) > 0
+    n, c = scales.shape
+    assert c <= 64, "Spectra are encoded in 64-bit bitmasks."
+
+    sizes = np.zeros((n, c), dtype=int)
+    widths = np.zeros((n, c), dtype=int)
+    variety = np.zeros((n, c), dtype=int) if varieties else None
+
+    d = scales.sum(axis=1)
+    for k in np.unique(d[d > 0]):
+        rows = np.flatnonzero(d == k)
+        # pitch classes as (d x n_d) matrices, so that reductions run over rows
+        pcs = np.nonzero(scales[rows])[1].reshape(-1, k).T.astype(np.int8, order="C")
+        octaves = np.vstack([pcs, pcs + np.int8(c)])
+        patterns = np.zeros(pcs.shape, dtype=np.uint64)
+
+        group = np.zeros((3, k, rows.shape[0]), dtype=int)
+        group[[0, 2], 0] = 1
+        for i in range(1, k):
+            steps = octaves[i : i + k] - pcs
+            bits = np.uint64(1) << steps.astype(np.uint64)
+
+            group[0, i] = _popcount(np.bitwise_or.reduce(bits, axis=0))
+            group[1, i] = steps.max(axis=0) - steps.min(axis=0)
+
+            if varieties:
+                patterns |= bits
+                distinct = np.diff(np.sort(patterns, axis=0), axis=0) != 0
+                group[2, i] = 1 + distinct.sum(axis=0)
+
+        sizes[rows, :k] = group[0].T
+        widths[rows, :k] = group[1].T
+        if varieties:
+            variety[rows, :k] = group[2].T
+
+    return sizes, widths, variety
+
+
+def spectra(s: np.ndarray):
+    """
+    Spectra of all generic intervals of a scale or of a matrix of scales.
+
+    Parameters
+    ----------
+    s : np.ndarray
+        scale of length c, or (n_scales x c) matrix of scales
+
+    Returns
+    -------
+    tuple
+        number of distinct specific sizes and spectrum width (largest minus
+        smallest size) of each generic interval i = 0, ..., c - 1 (zero for
+        i >= d), each of shape (c,) or (n_scales x c)
+    """
+    s = np.asarray(s)
+    sizes, widths, _ = _generic_intervals(s)
+    return (sizes, widths) if s.ndim > 1 else (sizes[0], widths[0])
+
+
+def is_MP(s: np.ndarray):
+    """
+    Tests whether scale(s) have Myhill's property: every generic interval
+    (1 <= i < d) comes in exactly two specific sizes.
+    """
+    s = np.asarray(s)
+    sizes, _, _ = _generic_intervals(s)
+    d = (np.atleast_2d(s) > 0).sum(axis=1)
+    generic = np.arange(sizes.shape[1]) < d[:, None]
+    mp = ((sizes == 2) | ~generic)[:, 1:].all(axis=1) & (d > 1)
+    return mp if s.ndim > 1 else bool(mp[0])
+
+
+def is_CV(s: np.ndarray):
+    """
+    Tests whether cardinality equals variety holds for scale(s): for every
+    n = 2, ..., d, the segments of n consecutive pitch classes come in
+    exactly n different interval patterns.
+    See: https://en.wikipedia.org/wiki/Cardinality_equals_variety
+    """
+    s = np.asarray(s)
+    _, _, varieties = _generic_intervals(s, varieties=True)
+    d = (np.atleast_2d(s) > 0).sum(axis=1)
+    generic = np.arange(varieties.shape[1]) < d[:, None]
+    # segments of n pitch classes span the generic interval n - 1
+    cv = ((varieties == np.arange(varieties.shape[1]) + 1) | ~generic)[:, 1:].all(
+        axis=1
+    )
+    return cv if s.ndim > 1 else bool(cv[0])
 
 
 def J(k: int, c: int, d: int, m: int) -> int:
@@ -139,6 +466,61 @@ def pcset(s: np.ndarray) -> np.ndarray:
     return np.argwhere(s > 0).flatten()
 
 
+def to_mask(pcset) -> int:
+    """
+    Converts a pc set to an integer bitmask, where bit p stands for pitch class p.
+    """
+    return sum(1 << int(p) for p in set(pcset))
+
+
+def to_masks(s: np.ndarray) -> np.ndarray:
+    """
+    Converts the rows of a scale matrix to bitmasks (dtype uint64, c <= 64),
+    where bit p stands for pitch class p.
+    """
+    scales = np.atleast_2d(np.asarray(s)) > 0
+    bits = scales.astype(np.uint64) << np.arange(scales.shape[1], dtype=np.uint64)
+    return np.bitwise_or.reduce(bits, axis=1)
+
+
+def from_mask(mask: int, c: int) -> np.ndarray:
+    """
+    Converts an integer bitmask back to the (sorted) pitch classes it contains.
+    """
+    return np.array([p for p in range(c) if (mask >> p) & 1], dtype=int)
+
+
+def rotate_mask(mask, n: int, c: int):
+    """
+    Transposes bitmask(s) by `n`, i.e. rotates their lowest `c` bits.
+
+    Works on Python integers as well as on numpy arrays of dtype uint64.
+    """
+    n = n % c
+    return ((mask << n) | (mask >> (c - n))) & ((1 << c) - 1)
+
+
+_REVERSE_STEPS = [
+    (1, 0x5555555555555555),
+    (2, 0x3333333333333333),
+    (4, 0x0F0F0F0F0F0F0F0F),
+    (8, 0x00FF00FF00FF00FF),
+    (16, 0x0000FFFF0000FFFF),
+    (32, 0x00000000FFFFFFFF),
+]
+
+
+def reverse_mask(mask, c: int):
+    """
+    Reverses the lowest `c` bits of bitmask(s), mapping pitch class p to c - 1 - p.
+
+    Works on Python integers as well as on numpy arrays of dtype uint64 (c <= 64).
+    """
+    for shift, pattern in _REVERSE_STEPS:
+        mask = ((mask >> shift) & pattern) | ((mask & pattern) << shift)
+    return mask >> (64 - c)
+
+
 def binary(pcset: np.ndarray, c: int) -> np.ndarray:
     """
     Converts a pc set to a binary vector representing the scale.
@@ -159,7 +541,33 @@ def binary(pcset: np.ndarray, c: int) -> np.ndarray:
     z[pcset] += 1
     return z
 
+
 def find_ngrams(input_list, n):
-  return zip(*[input_list[i:] for i in range(n)])
+    return zip(*[input_list[i:] for i in range(n)])
+
 
-print(transpose(1, 2))
+def map_chunks(func, chunks, workers: int = None, *args, **kwargs):
+    """
+    Yields ``func(chunk, *args, **kwargs)`` for every chunk of `chunks`.
+
+    The chunks are processed by a pool of `workers` processes (by default
+    ``os.cpu_count()``; 1 runs them in the calling process) with at most
+    two chunks per worker in flight, so that memory stays bounded however
+    many chunks there are. Results are yielded as they complete.
+    """
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        for chunk in chunks:
+            yield func(chunk, *args, **kwargs)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = set()
+        for chunk in chunks:
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(pool.submit(func, chunk, *args, **kwargs))
+        for future in pending:
+            yield future.result()